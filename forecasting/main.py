@@ -4,18 +4,21 @@ Main entry point for the forecasting application.
 This script orchestrates the data preparation and model training processes.
 """
 
+from __future__ import annotations
+
 import os
 import logging
 import argparse
-import pandas as pd
-from typing import Dict, Any, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 
 from src.config.constants import (
     DEFAULT_DATA_DIR, DEFAULT_INPUT_DIR, DEFAULT_LOG_LEVEL,
     LOG_FORMAT, DATE_FORMAT
 )
-from src.data_preparation.data_processor import DataProcessor
-from src.modeling.model_trainer import ModelTrainer
+from src.utils.file_utils import ensure_dir
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -71,7 +74,7 @@ def parse_args() -> argparse.Namespace:
     
     return parser.parse_args()
 
-def run_data_preparation(data_dir: str) -> str:
+def run_data_preparation(data_dir: str) -> Tuple[str, pd.DataFrame]:
     """
     Run the data preparation process.
     
@@ -79,11 +82,15 @@ def run_data_preparation(data_dir: str) -> str:
         data_dir: Parent data directory where combined data will be saved
         
     Returns:
-        Path to the prepared data file
+        Tuple containing:
+            - Path to the prepared data file
+            - The combined data, so training can use it without re-reading the file
     """
+    # Imported lazily so runs that skip this step don't pay for pandas/pyarrow
+    from src.data_preparation.data_processor import DataProcessor
     
     # Ensure data directory exists
-    os.makedirs(data_dir, exist_ok=True)
+    ensure_dir(data_dir)
     
     # Create data processor and prepare data with data_dir as output path
     processor = DataProcessor(
@@ -94,31 +101,37 @@ def run_data_preparation(data_dir: str) -> str:
     combined_data = processor.prepare_data(save_output=True)
     
     # Get the output path
-    dates = combined_data['Date'].sort_values().unique()
-    if len(dates) >= 2:
-        second_latest_date = pd.to_datetime(dates[-2]).strftime(DATE_FORMAT)
-    else:
-        second_latest_date = pd.to_datetime(dates[-1]).strftime(DATE_FORMAT)
+    second_latest_date = processor._get_second_latest_date(combined_data)
     
     output_path = os.path.join(data_dir, f"combined_data_until_{second_latest_date}.csv")
     
-    return output_path
+    # Prefer the columnar Parquet sidecar when it was written
+    parquet_path = os.path.splitext(output_path)[0] + ".parquet"
+    if os.path.exists(parquet_path):
+        return parquet_path, combined_data
+    
+    return output_path, combined_data
 
-def run_model_training(data_dir: str) -> tuple[str, str]:
+def run_model_training(data_dir: str, data: Optional[pd.DataFrame] = None) -> tuple[str, str]:
     """
     Run the model training process.
     
     Args:
         data_dir: Parent data directory where predictions will be saved
+        data: Combined data from the preparation step; read from data_dir if not given
         
     Returns:
         Tuple containing:
             - Path to the predictions file
             - Name of the best model (for reference, logging handled in ModelTrainer)
     """
+    # Imported lazily so runs that skip this step don't pay for scikit-learn
+    from src.modeling.model_trainer import ModelTrainer
+    
     # Create model trainer and generate predictions
-    # The combined_data is read from data_dir and predictions are saved to data_dir
-    trainer = ModelTrainer(data_dir=data_dir, output_dir=data_dir)
+    # The combined_data is used in memory when available, otherwise read from
+    # data_dir; predictions are saved to data_dir
+    trainer = ModelTrainer(data_dir=data_dir, output_dir=data_dir, data=data)
     predictions_path, predictions = trainer.train_and_predict()
     
     # Return both the path and the best model name which is available in the trainer object
@@ -140,22 +153,24 @@ def main() -> None:
     data_dir = os.path.abspath(args.data_dir)
     
     # Ensure data directory exists
-    os.makedirs(data_dir, exist_ok=True)
+    ensure_dir(data_dir)
     
     logger.info(f"Using data directory: {data_dir}")
     
     # Run data preparation if not skipped
+    combined_data = None
     if not args.skip_data_prep:
         # Combined data is saved to data_dir to be used for model training
-        data_path = run_data_preparation(data_dir=data_dir)
+        data_path, combined_data = run_data_preparation(data_dir=data_dir)
         logger.info(f"Data preparation complete, combined data saved to: {data_path}")
     else:
         logger.info("Skipping data preparation step...")
     
     # Run model training if not skipped
     if not args.skip_training:
-        # Combined data file from data_dir is used as input, and predictions are saved to data_dir
-        predictions_path, best_model = run_model_training(data_dir=data_dir)
+        # Combined data from the preparation step (or the file in data_dir) is used as
+        # input, and predictions are saved to data_dir
+        predictions_path, best_model = run_model_training(data_dir=data_dir, data=combined_data)
     else:
         logger.info("Skipping model training step...")
     
@@ -186,16 +201,16 @@ def run_forecasting_pipeline(data_dir: str = None, log_level: str = "INFO") -> s
     data_dir = os.path.abspath(data_dir)
     
     # Ensure data directory exists
-    os.makedirs(data_dir, exist_ok=True)
+    ensure_dir(data_dir)
     
     logger.info(f"Using data directory: {data_dir}")
     
     # Run data preparation
-    data_path = run_data_preparation(data_dir=data_dir)
+    data_path, combined_data = run_data_preparation(data_dir=data_dir)
     logger.info(f"Data preparation complete, combined data saved to: {data_path}")
     
-    # Run model training
-    predictions_path, best_model = run_model_training(data_dir=data_dir)
+    # Run model training on the in-memory combined data
+    predictions_path, best_model = run_model_training(data_dir=data_dir, data=combined_data)
     logger.info(f"Model training complete, predictions saved to: {predictions_path}")
     
     logger.info("Forecasting pipeline completed successfully!")
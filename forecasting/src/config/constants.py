@@ -22,6 +22,9 @@ MARKET_DATA_FILENAME = "market_data.csv"   # Standard filename for market data
 # Model Parameters
 DEFAULT_RANDOM_STATE = 42
 DEFAULT_CV_FOLDS = 5
+DEFAULT_MODEL_SET = "fast"  # "fast" or "full" (every regressor, opt-in)
+LARGE_DATASET_SAMPLES = 5000  # Above this, SVR and K-Neighbors are skipped
+SPARSE_OUTPUT_MAX_DENSITY = 0.3  # Below this share of non-zeros, the feature matrix stays sparse
 
 # Logging
 DEFAULT_LOG_LEVEL = "INFO"
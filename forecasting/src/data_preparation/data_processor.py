@@ -2,10 +2,18 @@
 Data processor for preparing forecasting model inputs.
 """
 
+import io
 import os
-import glob
+import re
+import shutil
 import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from typing import Optional, List, Dict, Any, Union, Tuple
 
 from ..config.constants import (
@@ -16,6 +24,50 @@ from ..config.constants import (
 # Configure module logger
 logger = logging.getLogger(__name__)
 
+# Known column types of the model prediction CSVs, declared up front so the
+# Arrow reader can skip type inference for them
+PREDICTION_COLUMN_TYPES = {
+    "Date": pa.timestamp("ns"),
+    "ticker": pa.string(),
+    "SARIMA_pred": pa.float64(),
+    "AutoTS_pred": pa.float64(),
+    "TimeMOE_pred": pa.float64(),
+    "actual": pa.float64(),
+}
+
+# Start and end dates in market_data_YYYYMMDD_YYYYMMDD directory names
+MARKET_DATA_DATES_RE = re.compile(r'_(\d{8})_(\d{8})$')
+
+# Prediction files combined on the last call, as the (path, mtime, size) of
+# each file and the parsed Arrow table, reused while none of the files change
+_prediction_cache: Optional[Tuple[Tuple[Tuple[str, int, int], ...], pa.Table]] = None
+
+@functools.lru_cache(maxsize=8)
+def _scan_dir(path: str, mtime: float, prefix: str = "", suffix: str = "",
+              dirs_only: bool = False) -> Tuple[str, ...]:
+    """
+    List directory entries matching a name prefix and suffix.
+    
+    The directory mtime is part of the cache key, so the listing is only
+    refreshed when entries are added to or removed from the directory.
+    
+    Args:
+        path: Directory to scan
+        mtime: Modification time of the directory
+        prefix: Required start of the entry name
+        suffix: Required end of the entry name
+        dirs_only: Whether to only return subdirectories
+        
+    Returns:
+        Tuple of matching entry paths
+    """
+    with os.scandir(path) as entries:
+        return tuple(
+            entry.path for entry in entries
+            if entry.name.startswith(prefix) and entry.name.endswith(suffix)
+            and (not dirs_only or entry.is_dir())
+        )
+
 class DataProcessor:
     """
     Processor for preparing and combining prediction data with market data.
@@ -24,7 +76,8 @@ class DataProcessor:
     def __init__(self, 
                  predictions_dir: Optional[str] = None,
                  market_data_dir: Optional[str] = None,
-                 output_path: Optional[str] = None):
+                 output_path: Optional[str] = None,
+                 required_market_cols: Optional[List[str]] = None):
         """
         Initialize the DataProcessor.
         
@@ -32,11 +85,23 @@ class DataProcessor:
             predictions_dir: Directory containing prediction CSV files
             market_data_dir: Directory containing market data files (defaults to scraping/scraped_data)
             output_path: Directory to save output files (defaults to 'forecasting/data/output')
+            required_market_cols: Market data columns to load (defaults to all columns);
+                'Date' is always included
         """
         # Default paths that will be overridden if provided
         self.predictions_dir = predictions_dir or DEFAULT_PREDICTIONS_DIR
         self.market_data_dir = market_data_dir or "scraping/scraped_data"
         self.output_path = output_path or DEFAULT_OUTPUT_DIR
+        self.required_market_cols = None
+        if required_market_cols is not None:
+            self.required_market_cols = ['Date'] + [col for col in required_market_cols if col != 'Date']
+        
+        # Resolve input directories against the project root (working directory) once
+        self._predictions_path = os.path.abspath(self.predictions_dir)
+        self._market_data_path = os.path.abspath(self.market_data_dir)
+        
+        # Market data loaded on a previous call, keyed by file path and mtime
+        self._market_cache: Optional[Tuple[str, float, pd.DataFrame]] = None
         
     def _find_prediction_files(self) -> List[str]:
         """
@@ -48,21 +113,15 @@ class DataProcessor:
         Raises:
             FileNotFoundError: If predictions directory or files are not found
         """
-        # Use project root instead of current file location
-        project_root = os.getcwd()
+        predictions_path = self._predictions_path
         
-        if os.path.isabs(self.predictions_dir):
-            predictions_path = self.predictions_dir
-        else:
-            predictions_path = os.path.join(project_root, self.predictions_dir)
-        
-        predictions_path = os.path.normpath(predictions_path)
-        
-        if not os.path.exists(predictions_path):
+        try:
+            mtime = os.stat(predictions_path).st_mtime
+        except FileNotFoundError:
             logger.error(f"Predictions directory does not exist: {predictions_path}")
             raise FileNotFoundError(f"Predictions directory not found at: {predictions_path}")
         
-        prediction_files = glob.glob(os.path.join(predictions_path, "*.csv"))
+        prediction_files = list(_scan_dir(predictions_path, mtime, suffix=".csv"))
         
         if not prediction_files:
             logger.error(f"No prediction files found in {predictions_path}")
@@ -83,61 +142,184 @@ class DataProcessor:
             FileNotFoundError: If market data file is not found
         """
         try:
-            # Use project root instead of current file location
-            project_root = os.getcwd()
-            
-            if os.path.isabs(self.market_data_dir):
-                base_data_dir = self.market_data_dir
-            else:
-                base_data_dir = os.path.join(project_root, self.market_data_dir)
-            
-            base_data_dir = os.path.normpath(base_data_dir)
+            base_data_dir = self._market_data_path
             
             # Find all market data directories
-            market_data_dirs = glob.glob(os.path.join(base_data_dir, MARKET_DATA_DIR_PATTERN))
+            market_data_dirs = []
+            if os.path.isdir(base_data_dir):
+                market_data_dirs = _scan_dir(
+                    base_data_dir,
+                    os.stat(base_data_dir).st_mtime,
+                    prefix=MARKET_DATA_DIR_PATTERN.rstrip('*'),
+                    dirs_only=True
+                )
             
-            if not market_data_dirs:
-                raise FileNotFoundError(f"No market data directories found matching pattern {MARKET_DATA_DIR_PATTERN} in {base_data_dir}")
+            # Parse the end date of each directory (market_data_YYYYMMDD_YYYYMMDD)
+            end_dates = {}
+            for market_dir in market_data_dirs:
+                match = MARKET_DATA_DATES_RE.search(market_dir)
+                if match:
+                    end_dates[market_dir] = int(match.group(2))
+                else:
+                    logger.warning(f"Skipping market data directory with unexpected name: {market_dir}")
             
-            # Sort by the end date in directory name (descending)
-            # Assuming directory format: market_data_YYYYMMDD_YYYYMMDD
-            market_data_dirs.sort(key=lambda x: x.split('_')[-1], reverse=True)
+            if not end_dates:
+                raise FileNotFoundError(f"No market data directories found matching pattern {MARKET_DATA_DIR_PATTERN} in {base_data_dir}")
             
-            # Get the latest directory
-            latest_market_dir = market_data_dirs[0]
+            # Pick the directory with the latest end date
+            latest_market_dir = max(end_dates, key=end_dates.get)
             logger.debug(f"Using latest market data directory: {latest_market_dir}")
             
             # Construct path to market_data.csv
             market_data_path = os.path.join(latest_market_dir, MARKET_DATA_FILENAME)
             
-            if not os.path.exists(market_data_path):
-                raise FileNotFoundError(f"{MARKET_DATA_FILENAME} not found in {latest_market_dir}")
+            # A single stat both checks that the file exists and gives the mtime
+            # used to reuse the previously loaded frame if the file is unchanged
+            try:
+                mtime = os.stat(market_data_path).st_mtime
+            except FileNotFoundError:
+                raise FileNotFoundError(f"{MARKET_DATA_FILENAME} not found in {latest_market_dir}") from None
+                
+            if self._market_cache is not None and self._market_cache[:2] == (market_data_path, mtime):
+                logger.info(f"Using cached market data from {market_data_path}")
+                return self._market_cache[2]
                 
             logger.info(f"Reading market data from {market_data_path}")
-            return pd.read_csv(market_data_path)
+            market_data = pd.read_csv(
+                market_data_path,
+                usecols=self.required_market_cols,
+                memory_map=True,
+                engine='c',
+                parse_dates=['Date']
+            )
+            self._market_cache = (market_data_path, mtime, market_data)
+            return market_data
             
         except FileNotFoundError as e:
             logger.error(f"Market data file not found: {str(e)}")
             raise
     
-    def _combine_predictions(self, prediction_files: List[str]) -> pd.DataFrame:
+    def _parse_prediction_csv(self, source: Any) -> pa.Table:
         """
-        Combine multiple prediction files into a single DataFrame.
+        Parse prediction CSV data into an Arrow table.
+        
+        Args:
+            source: File path or file-like object with CSV data
+            
+        Returns:
+            Arrow table with the parsed data
+        """
+        return pacsv.read_csv(
+            source,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20),
+            convert_options=pacsv.ConvertOptions(column_types=PREDICTION_COLUMN_TYPES)
+        )
+    
+    def _read_prediction_file(self, file: str) -> pa.Table:
+        """
+        Read a single prediction CSV file into an Arrow table.
+        
+        Args:
+            file: Path to the prediction CSV file
+            
+        Returns:
+            Arrow table with the file contents
+        """
+        logger.debug(f"Reading: {os.path.basename(file)}")
+        with pa.memory_map(file, 'r') as source:
+            return self._parse_prediction_csv(source)
+    
+    def _concatenate_prediction_files(self, prediction_files: List[str]) -> Optional[io.BytesIO]:
+        """
+        Concatenate the raw bytes of prediction files sharing the same header.
         
         Args:
             prediction_files: List of paths to prediction CSV files
             
         Returns:
-            Combined DataFrame of all predictions
+            Buffer with a single header followed by the rows of all files,
+            or None if the file headers differ
         """
-        dfs = []
+        header = None
+        buffer = io.BytesIO()
+        
         for file in prediction_files:
             logger.debug(f"Reading: {os.path.basename(file)}")
-            df = pd.read_csv(file)
-            dfs.append(df)
+            with open(file, 'rb') as f:
+                file_header = f.readline().rstrip(b'\r\n')
+                if header is None:
+                    header = file_header
+                    buffer.write(header + b'\n')
+                elif file_header != header:
+                    logger.debug(f"Header of {os.path.basename(file)} differs, reading files separately")
+                    return None
+                shutil.copyfileobj(f, buffer)
+            
+            # Make sure the next file's rows start on a new line
+            buffer.seek(-1, io.SEEK_END)
+            if buffer.read(1) != b'\n':
+                buffer.write(b'\n')
+        
+        buffer.seek(0)
+        return buffer
+    
+    def _read_prediction_table(self, prediction_files: List[str]) -> pa.Table:
+        """
+        Read multiple prediction files into a single Arrow table.
+        
+        Files with identical headers are concatenated as raw bytes and parsed
+        once; otherwise each file is parsed separately and the schemas unified.
+        
+        Args:
+            prediction_files: List of paths to prediction CSV files
+            
+        Returns:
+            Combined Arrow table of all predictions
+        """
+        # Nothing to combine for a single file, read it directly
+        if len(prediction_files) == 1:
+            return self._read_prediction_file(prediction_files[0])
+        
+        buffer = self._concatenate_prediction_files(prediction_files)
+        if buffer is not None:
+            logger.info("Combining prediction files...")
+            return self._parse_prediction_csv(buffer)
+        
+        # The Arrow reader releases the GIL, so files are read concurrently
+        with ThreadPoolExecutor(max_workers=min(8, len(prediction_files))) as executor:
+            tables = list(executor.map(self._read_prediction_file, prediction_files))
             
         logger.info("Combining prediction files...")
-        return pd.concat(dfs, ignore_index=True)
+        return pa.concat_tables(tables, promote_options="default")
+    
+    def _combine_predictions(self, prediction_files: List[str]) -> pd.DataFrame:
+        """
+        Combine multiple prediction files into a single DataFrame.
+        
+        The parsed data is kept in memory, so later calls in the same process
+        skip reading and parsing the files again unless one of them changed.
+        
+        Args:
+            prediction_files: List of paths to prediction CSV files
+            
+        Returns:
+            Combined DataFrame of all predictions
+        """
+        global _prediction_cache
+        
+        signature = tuple(
+            (file, stat.st_mtime_ns, stat.st_size)
+            for file, stat in zip(prediction_files, map(os.stat, prediction_files))
+        )
+        if _prediction_cache is not None and _prediction_cache[0] == signature:
+            logger.info("Using cached prediction data")
+            return _prediction_cache[1].to_pandas()
+        
+        # Arrow tables are immutable, so the cached table can't be changed by
+        # callers modifying the DataFrame built from it
+        table = self._read_prediction_table(prediction_files)
+        _prediction_cache = (signature, table)
+        return table.to_pandas()
     
     def _merge_with_market_data(self, 
                                predictions: pd.DataFrame, 
@@ -154,28 +336,54 @@ class DataProcessor:
         """
         logger.info("Converting date formats and preparing for weekly lag merge...")
         
-        # Ensure date columns are datetime type
-        predictions['Date'] = pd.to_datetime(predictions['Date'])
-        market_data['Date'] = pd.to_datetime(market_data['Date'])
+        # Ensure date columns are datetime type; prediction dates usually are
+        # already, as the Arrow reader parses them, so skip the re-conversion
+        for df in (predictions, market_data):
+            if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+                df['Date'] = pd.to_datetime(df['Date'])
         
-        # Create a new column for the market data date (one week before prediction)
-        predictions['MarketDate'] = predictions['Date'] - pd.Timedelta(days=7)
+        # Create a new column for the market data date (one week before prediction),
+        # computed on the raw datetime64[ns] array in a single vectorized pass
+        predictions['MarketDate'] = (
+            predictions['Date'].to_numpy(dtype='datetime64[ns]') - np.timedelta64(7, 'D')
+        )
         
-        # Merge using MarketDate from predictions and Date from market data
-        final_data = pd.merge(
-            predictions,
-            market_data,
-            left_on='MarketDate',
-            right_on='Date',
+        # Join on a sorted Date index instead of hashing the market Date column
+        market_indexed = market_data.set_index('Date').sort_index()
+        final_data = predictions.join(
+            market_indexed,
+            on='MarketDate',
             how='left',
-            suffixes=('', '_market')
+            rsuffix='_market'
         )
         
-        # Drop the extra Date columns
-        final_data = final_data.drop(columns=['MarketDate', 'Date_market'])
+        # Drop the helper key column
+        final_data.drop(columns=['MarketDate'], inplace=True)
         
         return final_data
     
+    def _downcast_numeric(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Downcast float64/int64 columns to the smallest dtype holding their values.
+        
+        Float columns are only cast to float32 when every value survives the
+        round trip unchanged, so no precision is lost.
+        
+        Args:
+            df: DataFrame to downcast in place
+            
+        Returns:
+            The same DataFrame with downcast numeric columns
+        """
+        for col in df.select_dtypes(include=['float64']).columns:
+            values = df[col].to_numpy()
+            if np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True):
+                df[col] = values.astype(np.float32)
+        for col in df.select_dtypes(include=['int64']).columns:
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+            
+        return df
+    
     def _get_second_latest_date(self, df: pd.DataFrame) -> str:
         """
         Get the second latest date from a DataFrame with a 'Date' column.
@@ -186,14 +394,42 @@ class DataProcessor:
         Returns:
             Second latest date in YYYYMMDD format
         """
-        sorted_dates = df['Date'].sort_values().unique()
+        # Two linear passes instead of sorting the whole column; several
+        # tickers share each date, so exclude the latest date explicitly
+        dates = pd.to_datetime(df['Date']).to_numpy()
+        latest_date = dates.max()
+        earlier_dates = dates[dates < latest_date]
         
-        if len(sorted_dates) >= 2:
-            second_latest_date = pd.to_datetime(sorted_dates[-2]).strftime(DATE_FORMAT)
+        if earlier_dates.size:
+            second_latest_date = earlier_dates.max()
         else:
-            second_latest_date = pd.to_datetime(sorted_dates[-1]).strftime(DATE_FORMAT)
+            second_latest_date = latest_date
             
-        return second_latest_date
+        return pd.Timestamp(second_latest_date).strftime(DATE_FORMAT)
+    
+    def _save_combined_data(self, final_data: pd.DataFrame, output_file_path: str) -> str:
+        """
+        Save the combined data as CSV plus a zstd-compressed Parquet sidecar.
+        
+        Args:
+            final_data: Combined DataFrame to save
+            output_file_path: Path of the output CSV file
+            
+        Returns:
+            Path to the Parquet sidecar file
+        """
+        parquet_file_path = os.path.splitext(output_file_path)[0] + ".parquet"
+        
+        # pyarrow's CSV writer always quotes the header and formats floats
+        # differently from pandas, so the CSV stays on pandas
+        logger.info(f"Saving combined data to {output_file_path}...")
+        final_data.to_csv(output_file_path, index=False)
+        
+        logger.info(f"Saving Parquet sidecar to {parquet_file_path}...")
+        table = pa.Table.from_pandas(final_data, preserve_index=False)
+        pq.write_table(table, parquet_file_path, compression='zstd', compression_level=3)
+        
+        return parquet_file_path
     
     def prepare_data(self, save_output: bool = True) -> pd.DataFrame:
         """
@@ -209,12 +445,16 @@ class DataProcessor:
         """
         logger.info("Starting data preparation...")
         
-        # Load and combine prediction data
-        prediction_files = self._find_prediction_files()
-        combined_predictions = self._combine_predictions(prediction_files)
-        
-        # Load market data
-        market_data = self._load_market_data()
+        # Load market data in the background while prediction data is read
+        # and combined; both are I/O bound and independent of each other
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            market_data_future = executor.submit(self._load_market_data)
+            
+            # Load and combine prediction data
+            prediction_files = self._find_prediction_files()
+            combined_predictions = self._combine_predictions(prediction_files)
+            
+            market_data = market_data_future.result()
         
         # Merge predictions with market data
         final_data = self._merge_with_market_data(combined_predictions, market_data)
@@ -222,18 +462,22 @@ class DataProcessor:
         # Optionally save the output
         if save_output:
             # Clean up old combined_data files before saving new one
-            from ..utils.file_utils import clean_old_files
+            from ..utils.file_utils import clean_old_files, ensure_dir
             clean_old_files(self.output_path, "combined_data_until_*.csv")
+            clean_old_files(self.output_path, "combined_data_until_*.parquet")
             
             second_latest_date = self._get_second_latest_date(final_data)
             output_filename = f"combined_data_until_{second_latest_date}.csv"
             output_file_path = os.path.join(self.output_path, output_filename)
             
             # Create directory if it doesn't exist
-            os.makedirs(self.output_path, exist_ok=True)
+            ensure_dir(self.output_path)
             
-            logger.info(f"Saving combined data to {output_file_path}...")
-            final_data.to_csv(output_file_path, index=False)
+            self._save_combined_data(final_data, output_file_path)
+        
+        # Halve the memory of the in-memory copy for columns that fit in 32 bits;
+        # the saved files keep the original dtypes
+        final_data = self._downcast_numeric(final_data)
         
         logger.info("Data preparation complete!")
         logger.info(f"Final dataset shape: {final_data.shape}")
@@ -5,33 +5,112 @@ Trainer module for forecasting models.
 import os
 import pandas as pd
 import numpy as np
-import json
+import scipy.sparse as sp
+import orjson
 import logging
-import argparse
-from typing import Dict, List, Tuple, Any, Optional, Union
-from sklearn.model_selection import cross_val_score, KFold
+from typing import Dict, List, Literal, Tuple, Any, Optional, Union
+from joblib import Memory, Parallel, delayed
+from sklearn.model_selection import cross_validate, KFold, train_test_split
+from sklearn.base import clone
 from sklearn.ensemble import (
     RandomForestRegressor,
-    GradientBoostingRegressor, 
-    AdaBoostRegressor,
+    HistGradientBoostingRegressor,
     ExtraTreesRegressor
 )
 from sklearn.linear_model import LinearRegression, Ridge, Lasso
 from sklearn.svm import SVR
 from sklearn.tree import DecisionTreeRegressor
 from sklearn.neighbors import KNeighborsRegressor
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
 from sklearn.metrics import mean_absolute_error, r2_score
 
 from ..config.constants import (
     DEFAULT_OUTPUT_DIR, DEFAULT_DATA_DIR, DEFAULT_RANDOM_STATE, 
-    DEFAULT_CV_FOLDS, COMBINED_DATA_PATTERN, PREDICTIONS_PATTERN
+    DEFAULT_CV_FOLDS, DEFAULT_MODEL_SET, LARGE_DATASET_SAMPLES, SPARSE_OUTPUT_MAX_DENSITY,
+    COMBINED_DATA_PATTERN, PREDICTIONS_PATTERN
 )
 from ..utils.file_utils import find_latest_file, get_next_friday, clean_old_files
 
 # Configure module logger
 logger = logging.getLogger(__name__)
 
+# Models only evaluated with model_set='full', as they overlap with cheaper ones
+FULL_SET_ONLY_MODELS = ("Ridge Regression", "Random Forest", "Extra Trees")
+
+# Model families the screen in _screen_models chooses between; every model of
+# the fast set belongs to one of them
+LINEAR_MODELS = ("Linear Regression", "Ridge Regression", "Lasso Regression")
+NONLINEAR_MODELS = ("Hist Gradient Boosting", "Random Forest", "Extra Trees", "Decision Tree",
+                    "Support Vector Regression", "K-Neighbors")
+
+# Metrics computed for each model during cross-validation
+CV_SCORING = {'mae': 'neg_mean_absolute_error', 'r2': 'r2'}
+
+def _as_float32(X: Union[np.ndarray, sp.spmatrix]) -> Union[np.ndarray, sp.spmatrix]:
+    """
+    Cast a feature matrix to float32, which halves the memory traffic of every fit.
+    
+    Args:
+        X: Dense or sparse feature matrix
+        
+    Returns:
+        The float32 matrix, C-contiguous when dense
+    """
+    if sp.issparse(X):
+        return X.astype(np.float32, copy=False)
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+def _cross_validate_model(model: Any, X: pd.DataFrame, y: np.ndarray,
+                          n_cv_folds: int, random_state: int, n_jobs: int = 1) -> Dict[str, Any]:
+    """
+    Cross-validate a single model, scoring MAE and R² from one fit per fold.
+    
+    The fitted fold estimators are returned as well, so the selected model
+    does not need another fit on the full data.
+    
+    Args:
+        model: Unfitted regression model or pipeline
+        X: Features
+        y: Target vector
+        n_cv_folds: Number of cross-validation folds
+        random_state: Seed of the fold shuffling
+        n_jobs: Number of folds evaluated in parallel
+        
+    Returns:
+        Dictionary of per-fold scores and fitted estimators as returned by cross_validate
+    """
+    cv = KFold(n_splits=n_cv_folds, shuffle=True, random_state=random_state)
+    return cross_validate(model, X, y, cv=cv, scoring=CV_SCORING, n_jobs=n_jobs,
+                          return_estimator=True)
+
+class FoldEnsemble:
+    """
+    Averages the predictions of the estimators fitted on each cross-validation fold.
+    """
+    
+    def __init__(self, estimators: List[Any]):
+        """
+        Initialize the FoldEnsemble.
+        
+        Args:
+            estimators: Fitted estimators, one per fold
+        """
+        self.estimators = estimators
+        
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Predict with every fold estimator and average the results.
+        
+        Args:
+            X: Features
+            
+        Returns:
+            Mean prediction of the fold estimators
+        """
+        return np.mean([estimator.predict(X) for estimator in self.estimators], axis=0)
+
 class ModelTrainer:
     """
     Trains regression models and predicts next Friday's values.
@@ -41,7 +120,10 @@ class ModelTrainer:
                  data_dir: str = DEFAULT_DATA_DIR,
                  output_dir: str = DEFAULT_OUTPUT_DIR,
                  random_state: int = DEFAULT_RANDOM_STATE,
-                 n_cv_folds: int = DEFAULT_CV_FOLDS):
+                 n_cv_folds: int = DEFAULT_CV_FOLDS,
+                 data: Optional[pd.DataFrame] = None,
+                 model_set: Literal['fast', 'full'] = DEFAULT_MODEL_SET,
+                 cache_cv: bool = False):
         """
         Initialize the ModelTrainer.
         
@@ -50,27 +132,56 @@ class ModelTrainer:
             output_dir: Directory to save prediction outputs
             random_state: Random seed for reproducibility
             n_cv_folds: Number of cross-validation folds
+            data: Combined data already in memory; when given, no file is read from data_dir
+            model_set: 'fast' evaluates a reduced set of regressors (Ridge is skipped as
+                it overlaps with Linear and Lasso Regression, Random Forest and Extra Trees
+                as Hist Gradient Boosting covers the tree ensembles); 'full' evaluates all of them
+            cache_cv: Whether to cache cross-validation results on disk (in
+                output_dir/.cv_cache), so unchanged models and data are not re-evaluated.
+                Off by default: the cache is unbounded and only pays off when the same
+                data is trained on repeatedly; call clear_cache() to remove it
         """
         self.data_dir = data_dir
+        self.data = data
         self.output_dir = output_dir
         self.random_state = random_state
         self.n_cv_folds = n_cv_folds
+        self.model_set = model_set
         self.best_model = None
         self.best_model_name = None
-        self.encoder = OneHotEncoder(sparse_output=False, handle_unknown='ignore')
-        self.scaler = StandardScaler()
+        self.preprocessor = None
         
-    def _initialize_models(self) -> Dict[str, Any]:
+        # Cross-validation results keyed on the model, data and fold settings,
+        # plus the preprocessors fitted on each fold
+        self.memory = Memory(
+            location=os.path.join(self.output_dir, '.cv_cache') if cache_cv else None,
+            verbose=0
+        )
+        self._cached_cross_validate = self.memory.cache(_cross_validate_model, ignore=['n_jobs'])
+        
+    def clear_cache(self) -> None:
+        """
+        Remove all cached cross-validation results and fitted preprocessors.
+        """
+        self.memory.clear(warn=False)
+        
+    def _initialize_models(self, n_samples: Optional[int] = None) -> Dict[str, Any]:
         """
         Initialize regression models to evaluate.
         
+        Args:
+            n_samples: Number of training samples; on large datasets the models
+                that scale super-linearly with the sample count are skipped
+        
         Returns:
             Dictionary mapping model names to model objects
         """
-        return {
-            "Random Forest": RandomForestRegressor(random_state=self.random_state),
-            "Gradient Boosting": GradientBoostingRegressor(random_state=self.random_state),
-            "AdaBoost": AdaBoostRegressor(random_state=self.random_state),
+        models = {
+            # Each tree sees a half-size bootstrap sample
+            "Random Forest": RandomForestRegressor(random_state=self.random_state, max_samples=0.5),
+            "Hist Gradient Boosting": HistGradientBoostingRegressor(
+                random_state=self.random_state, early_stopping=True
+            ),
             "Linear Regression": LinearRegression(),
             "Ridge Regression": Ridge(),
             "Lasso Regression": Lasso(),
@@ -79,6 +190,17 @@ class ModelTrainer:
             "K-Neighbors": KNeighborsRegressor(),
             "Extra Trees": ExtraTreesRegressor(random_state=self.random_state)
         }
+        
+        if self.model_set != 'full':
+            for name in FULL_SET_ONLY_MODELS:
+                del models[name]
+            
+        if n_samples is not None and n_samples > LARGE_DATASET_SAMPLES:
+            logger.info(f"{n_samples} samples, skipping Support Vector Regression and K-Neighbors")
+            del models["Support Vector Regression"]
+            del models["K-Neighbors"]
+            
+        return models
     
     def _load_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
@@ -91,24 +213,32 @@ class ModelTrainer:
             FileNotFoundError: If no combined data file is found
         """
         try:
-            # Find the latest combined_data file from the data_dir (should be input directory)
-            data_file = find_latest_file(self.data_dir, COMBINED_DATA_PATTERN)
-            df = pd.read_csv(data_file)
-            logger.info(f"Loaded data from {data_file}, shape: {df.shape}")
+            if self.data is not None:
+                # Shallow copy so the forward fill below doesn't alter the caller's frame
+                df = self.data.copy(deep=False)
+                logger.info(f"Using in-memory data, shape: {df.shape}")
+            else:
+                # Find the latest combined_data file from the data_dir (should be input directory)
+                data_file = find_latest_file(self.data_dir, COMBINED_DATA_PATTERN)
+                
+                # Read the Parquet sidecar written alongside the CSV if present
+                parquet_file = os.path.splitext(data_file)[0] + ".parquet"
+                if os.path.exists(parquet_file):
+                    data_file = parquet_file
+                    df = pd.read_parquet(data_file)
+                else:
+                    # Multi-threaded Arrow parser; ticker goes straight to a categorical for the encoder
+                    df = pd.read_csv(data_file, engine='pyarrow', dtype={'ticker': 'category'})
+                logger.info(f"Loaded data from {data_file}, shape: {df.shape}")
             
             # Forward fill specific columns if they have NaN values
             columns_to_ffill = ['CPI', 'UnemploymentRate', 'FEDFUNDS', 'DFF', 'GDP']
             existing_columns = [col for col in columns_to_ffill if col in df.columns]
             
             if existing_columns:
-                # Check if any of the columns have NaN values
-                has_nan = df[existing_columns].isna().any().any()
-                if has_nan:
-                    logger.info(f"Forward filling NaN values in columns: {existing_columns}")
-                    df[existing_columns] = df[existing_columns].fillna(method='ffill')
-                    logger.info(f"Forward fill completed for {existing_columns}")
-                else:
-                    logger.info(f"No NaN values found in {existing_columns}")
+                # ffill is a no-op on columns without NaN values, so no need to check first
+                logger.info(f"Forward filling NaN values in columns: {existing_columns}")
+                df[existing_columns] = df[existing_columns].ffill()
             else:
                 logger.info("None of the specified ffill columns found in data")
             
@@ -128,104 +258,177 @@ class ModelTrainer:
             logger.error(f"Error loading data: {e}")
             raise
     
-    def _preprocess_data(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, List[str], List[str]]:
+    def _preprocess_data(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray, List[str], List[str]]:
         """
-        Preprocess the data for model training.
+        Split the data into features and target and set up the feature preprocessor.
+        
+        The scaler and encoder are not fitted here: they are fitted inside each
+        model's pipeline, so every cross-validation fold only sees statistics
+        of its own training split.
         
         Args:
             df: DataFrame to preprocess
             
         Returns:
             Tuple containing:
-                - Processed feature matrix
+                - Feature DataFrame
                 - Target vector
                 - List of categorical column names
                 - List of numerical column names
         """
-        # Separate features and target
-        X = df.drop("actual", axis=1)
-        y = df[["actual"]].values.ravel()
-        
         # Identify categorical and numerical columns
-        categorical_cols = X.select_dtypes(include=['object']).columns.tolist()
-        numerical_cols = X.select_dtypes(include=[np.number]).columns.tolist()
+        features = df.drop("actual", axis=1)
+        categorical_cols = features.select_dtypes(include=['object', 'category']).columns.tolist()
+        numerical_cols = features.select_dtypes(include=[np.number]).columns.tolist()
+        
+        # Separate features and target; float32 numerical columns let the scaler and
+        # the column stacking produce the float32 feature matrix in a single allocation
+        X = df[categorical_cols + numerical_cols].astype(dict.fromkeys(numerical_cols, np.float32))
+        y = df["actual"].to_numpy(dtype=np.float32)
         
-        # Process features
+        transformers = [('num', StandardScaler(), numerical_cols)]
         if categorical_cols:
-            self.encoder.fit(X[categorical_cols])
-            X_encoded = self.encoder.transform(X[categorical_cols])
+            transformers.append(
+                ('cat', OneHotEncoder(sparse_output=True, handle_unknown='ignore', dtype=np.float32),
+                 categorical_cols)
+            )
+        # Output stays sparse when the one-hot columns make the matrix mostly zeros
+        self.preprocessor = ColumnTransformer(transformers, sparse_threshold=SPARSE_OUTPUT_MAX_DENSITY)
+        
+        return X, y, categorical_cols, numerical_cols
+    
+    def _make_pipeline(self, model: Any) -> Pipeline:
+        """
+        Chain the feature preprocessor and a model.
+        
+        Args:
+            model: Unfitted regression model
             
-            # Scale numerical features
-            self.scaler.fit(X[numerical_cols])
-            X_num = self.scaler.transform(X[numerical_cols])
+        Returns:
+            Pipeline that preprocesses the features and fits the model
+        """
+        preprocessor = self.preprocessor
+        if isinstance(model, HistGradientBoostingRegressor):
+            # HistGradientBoosting only accepts dense input
+            preprocessor = clone(preprocessor).set_params(sparse_threshold=0)
+        
+        return Pipeline(
+            [
+                ('preprocess', preprocessor),
+                ('to_float32', FunctionTransformer(_as_float32)),
+                ('model', model)
+            ],
+            # The preprocessor fitted on a fold is reused by every model evaluated on that fold
+            memory=self.memory
+        )
+    
+    def _screen_models(self, X: pd.DataFrame, y: np.ndarray) -> Tuple[str, ...]:
+        """
+        Pick the model family worth cross-validating from a single hold-out split.
+        
+        A linear model and a small gradient boosting model, standing in for the
+        non-linear models (tree ensembles, SVR and K-Neighbors), are compared on
+        one 80/20 split, which costs far less than cross-validating every model.
+        
+        Args:
+            X: Features
+            y: Target vector
             
-            # Combine numerical and categorical features
-            X_processed = np.hstack([X_num, X_encoded])
-        else:
-            self.scaler.fit(X)
-            X_processed = self.scaler.transform(X)
+        Returns:
+            Names of the models in the family with the lower hold-out MAE
+        """
+        X_fit, X_val, y_fit, y_val = train_test_split(X, y, test_size=0.2, random_state=self.random_state)
+        
+        maes = {}
+        for family, model in ((LINEAR_MODELS, Ridge()),
+                              (NONLINEAR_MODELS, HistGradientBoostingRegressor(max_iter=50,
+                                                                               random_state=self.random_state))):
+            pipeline = self._make_pipeline(model).fit(X_fit, y_fit)
+            maes[family] = mean_absolute_error(y_val, pipeline.predict(X_val))
         
-        return X_processed, y, categorical_cols, numerical_cols
+        family = min(maes, key=maes.get)
+        logger.info(f"Screening selected {', '.join(family)} (hold-out MAE {maes[family]:.4f})")
+        return family
     
-    def _evaluate_models(self, X: np.ndarray, y: np.ndarray) -> pd.DataFrame:
+    def _evaluate_models(self, X: pd.DataFrame, y: np.ndarray,
+                         model_names: Optional[Tuple[str, ...]] = None) -> Tuple[pd.DataFrame, Dict[str, List[Any]]]:
         """
         Evaluate multiple regression models using cross-validation.
         
         Args:
             X: Feature matrix
             y: Target vector
+            model_names: Names of the models to evaluate; all initialized models when None
             
         Returns:
-            DataFrame with model evaluation metrics
+            Tuple containing:
+                - DataFrame with model evaluation metrics
+                - Dictionary mapping model names to their pipelines fitted on each fold
         """
-        models = self._initialize_models()
-        cv = KFold(n_splits=self.n_cv_folds, shuffle=True, random_state=self.random_state)
+        models = {
+            name: self._make_pipeline(model)
+            for name, model in self._initialize_models(n_samples=X.shape[0]).items()
+            if model_names is None or name in model_names
+        }
         
-        results = []
-        for name, model in models.items():
+        # Parallelize across models when there are more models than folds,
+        # otherwise across the folds of each model; never both, so the cores
+        # are not oversubscribed
+        n_cpus = os.cpu_count() or 1
+        outer_jobs = min(len(models), n_cpus) if len(models) > self.n_cv_folds else 1
+        inner_jobs = 1 if outer_jobs > 1 else min(self.n_cv_folds, n_cpus)
+        
+        def evaluate(name, model):
             logger.info(f"Evaluating {name}...")
-            
-            # Calculate cross-validation scores
-            scores_mae = cross_val_score(
-                model, X, y, cv=cv, scoring='neg_mean_absolute_error'
-            )
-            scores_r2 = cross_val_score(
-                model, X, y, cv=cv, scoring='r2'
-            )
-            
-            # Record results
-            results.append({
-                'model': name,
-                'mean_mae': -scores_mae.mean(),
-                'std_mae': scores_mae.std(),
-                'mean_r2': scores_r2.mean(),
-                'std_r2': scores_r2.std()
-            })
-            
-            logger.debug(
-                f"{name} - Mean MAE: {-scores_mae.mean():.4f} "
-                f"(±{scores_mae.std():.4f}), Mean R²: {scores_r2.mean():.4f} "
-                f"(±{scores_r2.std():.4f})"
+            # All models share the same seed, so the folds are identical
+            return delayed(self._cached_cross_validate)(
+                model, X, y, self.n_cv_folds, self.random_state, n_jobs=inner_jobs
             )
         
-        return pd.DataFrame(results)
+        all_scores = Parallel(n_jobs=outer_jobs)(
+            evaluate(name, model) for name, model in models.items()
+        )
+        
+        fold_estimators = {name: scores['estimator'] for name, scores in zip(models, all_scores)}
+        
+        # Aggregate the per-fold scores of all models at once, one row per model
+        scores_mae = np.array([scores['test_mae'] for scores in all_scores]).reshape(len(models), -1)
+        scores_r2 = np.array([scores['test_r2'] for scores in all_scores]).reshape(len(models), -1)
+        results_df = pd.DataFrame({
+            'model': list(models),
+            'mean_mae': -scores_mae.mean(axis=1),
+            'std_mae': scores_mae.std(axis=1),
+            'mean_r2': scores_r2.mean(axis=1),
+            'std_r2': scores_r2.std(axis=1)
+        })
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            for row in results_df.itertuples(index=False):
+                logger.debug(
+                    f"{row.model} - Mean MAE: {row.mean_mae:.4f} "
+                    f"(±{row.std_mae:.4f}), Mean R²: {row.mean_r2:.4f} "
+                    f"(±{row.std_r2:.4f})"
+                )
+        
+        return results_df, fold_estimators
     
-    def _select_best_model(self, results_df: pd.DataFrame) -> Tuple[str, Any]:
+    def _select_best_model(self, results_df: pd.DataFrame,
+                           fold_estimators: Dict[str, List[Any]]) -> Tuple[str, FoldEnsemble]:
         """
         Select the best model based on mean MAE.
         
         Args:
             results_df: DataFrame with model evaluation results
+            fold_estimators: Dictionary mapping model names to their pipelines fitted on each fold
             
         Returns:
-            Tuple with best model name and model object
+            Tuple with best model name and the ensemble of its fold pipelines
         """
         # Select model with lowest mean MAE
         best_model_name = results_df.sort_values('mean_mae').iloc[0]['model']
         
-        # Get the model object
-        models = self._initialize_models()
-        best_model = models[best_model_name]
+        # The fold pipelines are already fitted, so no refit on the full data is needed
+        best_model = FoldEnsemble(fold_estimators[best_model_name])
         
         logger.info(f"Best model: {best_model_name}")
         return best_model_name, best_model
@@ -233,9 +436,9 @@ class ModelTrainer:
     def _preprocess_test_data(self, 
                              test_df: pd.DataFrame, 
                              categorical_cols: List[str],
-                             numerical_cols: List[str]) -> np.ndarray:
+                             numerical_cols: List[str]) -> pd.DataFrame:
         """
-        Preprocess test data using fitted encoder and scaler.
+        Select the test features; they are transformed by the fitted pipeline.
         
         Args:
             test_df: Test DataFrame
@@ -243,21 +446,17 @@ class ModelTrainer:
             numerical_cols: List of numerical column names
             
         Returns:
-            Processed test feature matrix
+            Test feature DataFrame with the training columns and dtypes
         """
-        if categorical_cols:
-            test_encoded = self.encoder.transform(test_df[categorical_cols])
-            test_num = self.scaler.transform(test_df[numerical_cols])
-            return np.hstack([test_num, test_encoded])
-        else:
-            return self.scaler.transform(test_df)
+        return test_df[categorical_cols + numerical_cols].astype(dict.fromkeys(numerical_cols, np.float32))
     
-    def _save_predictions(self, test_df: pd.DataFrame) -> str:
+    def _save_predictions(self, predictions: Dict[str, float], prediction_date: str) -> str:
         """
         Save predictions as ticker:prediction pairs in JSON format.
         
         Args:
-            test_df: DataFrame with predictions
+            predictions: Dictionary of ticker:prediction pairs
+            prediction_date: Date the predictions are for, in YYYYMMDD format
             
         Returns:
             Path to saved prediction file
@@ -265,13 +464,10 @@ class ModelTrainer:
         # Clean up old prediction files
         clean_old_files(self.output_dir, PREDICTIONS_PATTERN)
         
-        # Get next Friday date
-        next_friday = get_next_friday()
-        
         # Create predictions dictionary with date at the beginning
         pred_dict = {
-            "prediction_date": next_friday,
-            "predictions": dict(zip(test_df['ticker'], test_df['prediction']))
+            "prediction_date": prediction_date,
+            "predictions": predictions
         }
         
         # Create output directory if it doesn't exist
@@ -280,8 +476,8 @@ class ModelTrainer:
         # Save predictions to JSON with simplified filename
         json_path = os.path.join(self.output_dir, "next_friday_predictions.json")
         
-        with open(json_path, 'w') as f:
-            json.dump(pred_dict, f, indent=2)
+        with open(json_path, 'wb') as f:
+            f.write(orjson.dumps(pred_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
             
         logger.info(f"Predictions saved to {json_path}")
         return json_path
@@ -303,12 +499,13 @@ class ModelTrainer:
         # Preprocess training data
         X_train, y_train, categorical_cols, numerical_cols = self._preprocess_data(train_df)
         
-        # Evaluate models and select the best
-        results_df = self._evaluate_models(X_train, y_train)
-        self.best_model_name, self.best_model = self._select_best_model(results_df)
+        # Only the full model set cross-validates every model; otherwise a cheap
+        # screen decides between the linear and the non-linear models first
+        model_names = self._screen_models(X_train, y_train) if self.model_set != 'full' else None
         
-        # Train the best model on all data
-        self.best_model.fit(X_train, y_train)
+        # Evaluate models and select the best
+        results_df, fold_estimators = self._evaluate_models(X_train, y_train, model_names)
+        self.best_model_name, self.best_model = self._select_best_model(results_df, fold_estimators)
         logger.info(f"Model training complete using {self.best_model_name} model.")
         
         # Preprocess test data
@@ -317,77 +514,11 @@ class ModelTrainer:
         # Generate predictions
         test_df['prediction'] = self.best_model.predict(X_test)
         
-        # Save predictions
-        json_path = self._save_predictions(test_df)
+        # Build the ticker:prediction pairs once for both the file and the caller
+        pred_map = test_df.set_index('ticker')['prediction'].astype(float).to_dict()
+        
+        # Save predictions for next Friday
+        json_path = self._save_predictions(pred_map, get_next_friday())
         
         # Return results
-        return json_path, dict(zip(test_df['ticker'], test_df['prediction']))
-
-
-def configure_logging(level: str = 'INFO') -> None:
-    """
-    Configure logging for the application.
-    
-    Args:
-        level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-    """
-    logging.basicConfig(
-        level=getattr(logging, level),
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[logging.StreamHandler()]
-    )
-
-def parse_args() -> argparse.Namespace:
-    """
-    Parse command-line arguments.
-    
-    Returns:
-        Parsed arguments namespace
-    """
-    parser = argparse.ArgumentParser(
-        description="Train regression models and predict next Friday's values."
-    )
-    parser.add_argument(
-        '--log-level', 
-        dest='loglevel', 
-        default='INFO',
-        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
-        help='Set the logging level (default: INFO)'
-    )
-    parser.add_argument(
-        '--data-dir',
-        dest='data_dir',
-        default='forecasting/data/output',
-        help='Directory containing input data files'
-    )
-    parser.add_argument(
-        '--output-dir',
-        dest='output_dir',
-        default='forecasting/data/output',
-        help='Directory to save prediction outputs'
-    )
-    return parser.parse_args()
-
-def main() -> None:
-    """
-    Main entry point for the application.
-    """
-    # Parse command-line arguments
-    args = parse_args()
-    
-    # Configure logging
-    configure_logging(args.loglevel)
-    
-    # Create and use the model trainer
-    trainer = ModelTrainer(
-        data_dir=args.data_dir,
-        output_dir=args.output_dir
-    )
-    
-    # Train and generate predictions
-    json_path, predictions = trainer.train_and_predict()
-    
-    logger.info(f"Process complete.")
-
-if __name__ == "__main__":
-    main()
+        return json_path, pred_map
@@ -3,15 +3,48 @@ File utility functions for the forecasting model.
 """
 
 import os
+import re
 import glob
+import fnmatch
 import logging
-from datetime import datetime, timedelta
+import functools
+from datetime import date, timedelta
 from typing import List, Optional, Dict, Any, Union
 
 from ..config.constants import DATE_FORMAT
 
 logger = logging.getLogger(__name__)
 
+# Directories already created (or found to exist) by ensure_dir in this process
+_ENSURED_DIRS = set()
+
+def ensure_dir(directory: str) -> None:
+    """
+    Create a directory if needed, at most once per process for each path.
+    
+    Args:
+        directory: The directory to create
+    """
+    directory = os.path.abspath(directory)
+    if directory in _ENSURED_DIRS:
+        return
+    
+    os.makedirs(directory, exist_ok=True)
+    _ENSURED_DIRS.add(directory)
+
+@functools.lru_cache(maxsize=1024)
+def _file_number(file_path: str) -> int:
+    """
+    Parse the trailing number of a filename, e.g. 20250620 in combined_data_until_20250620.csv.
+    
+    Args:
+        file_path: Path of the file
+        
+    Returns:
+        The number after the last underscore of the file's base name
+    """
+    return int(os.path.splitext(os.path.basename(file_path))[0].rsplit('_', 1)[-1])
+
 def find_latest_file(directory: str, pattern: str) -> str:
     """
     Find the latest file in a directory matching a given pattern.
@@ -33,11 +66,8 @@ def find_latest_file(directory: str, pattern: str) -> str:
         logger.error(f"No files matching {pattern} found in {directory}")
         raise FileNotFoundError(f"No files matching {pattern} found in {directory}")
     
-    # Sort files by the number in the filename (descending)
-    matching_files.sort(key=lambda x: int(os.path.splitext(os.path.basename(x))[0].split('_')[-1]), 
-                      reverse=True)
-    
-    latest_file = matching_files[0]
+    # Pick the file with the highest number in the filename
+    latest_file = max(matching_files, key=_file_number)
     logger.debug(f"Latest file found: {latest_file}")
     return latest_file
 
@@ -74,14 +104,10 @@ def get_next_friday() -> str:
     Returns:
         The date of the next Friday in YYYYMMDD format
     """
-    today = datetime.now()
-    days_ahead = 4 - today.weekday()  # 4 = Friday
-    
-    if days_ahead <= 0:
-        days_ahead += 7
-        
-    next_friday = today + timedelta(days=days_ahead)
-    return next_friday.strftime(DATE_FORMAT)
+    today = date.today()
+    # 4 = Friday; on a Friday the following week's Friday is returned
+    days_ahead = (4 - today.weekday()) % 7 or 7
+    return (today + timedelta(days=days_ahead)).strftime(DATE_FORMAT)
 
 def clean_old_files(directory: str, pattern: str) -> None:
     """
@@ -91,9 +117,21 @@ def clean_old_files(directory: str, pattern: str) -> None:
         directory: The directory containing the files
         pattern: The glob pattern to match files to be removed
     """
-    for file_path in glob.glob(os.path.join(directory, pattern)):
+    name_regex = re.compile(fnmatch.translate(pattern))
+    try:
+        with os.scandir(directory) as entries:
+            old_files = [entry.path for entry in entries
+                         if entry.is_file() and name_regex.match(entry.name)]
+    except FileNotFoundError:
+        return
+    
+    deleted = 0
+    for file_path in old_files:
         try:
-            os.remove(file_path)
-            logger.info(f"Deleted old file: {file_path}")
+            os.unlink(file_path)
+            deleted += 1
         except Exception as e:
             logger.warning(f"Could not delete file {file_path}: {e}")
+    
+    if deleted:
+        logger.info(f"Deleted {deleted} old file(s) matching {pattern} in {directory}")
@@ -9,6 +9,7 @@ import pandas as pd
 import numpy as np
 import sys
 import io
+import tempfile
 
 # Add the parent directory to the path so we can import the module under test
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -23,76 +24,146 @@ class TestDataProcessor(unittest.TestCase):
         """Set up test fixtures."""
         self.data_processor = DataProcessor()
     
-    @patch('src.data_preparation.data_processor.get_file_path')
-    @patch('src.data_preparation.data_processor.glob.glob')
-    def test_find_prediction_files(self, mock_glob, mock_get_path):
+    def test_find_prediction_files(self):
         """Test finding prediction files."""
-        # Configure mocks
-        mock_get_path.return_value = '/mocked/path/to/predictions'
-        mock_glob.return_value = [
-            '/mocked/path/to/predictions/file1.csv', 
-            '/mocked/path/to/predictions/file2.csv'
-        ]
-        
-        # Call the method
-        result = self.data_processor._find_prediction_files()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ['file1.csv', 'file2.csv', 'notes.txt']:
+                open(os.path.join(tmp_dir, name), 'w').close()
+            
+            # Call the method
+            processor = DataProcessor(predictions_dir=tmp_dir)
+            result = processor._find_prediction_files()
         
         # Verify the result
         self.assertEqual(len(result), 2)
-        self.assertEqual(result[0], '/mocked/path/to/predictions/file1.csv')
-        
-        # Verify mocks were called correctly
-        mock_get_path.assert_called_once()
-        mock_glob.assert_called_once()
+        self.assertEqual(
+            sorted(os.path.basename(f) for f in result),
+            ['file1.csv', 'file2.csv']
+        )
+    
+    def test_find_prediction_files_missing_dir(self):
+        """Test that a missing predictions directory raises FileNotFoundError."""
+        processor = DataProcessor(predictions_dir='/nonexistent/predictions')
+        with self.assertRaises(FileNotFoundError):
+            processor._find_prediction_files()
     
-    @patch('src.data_preparation.data_processor.get_file_path')
-    @patch('src.data_preparation.data_processor.glob.glob')
-    @patch('src.data_preparation.data_processor.os.path.exists')
     @patch('pandas.read_csv')
-    def test_load_market_data(self, mock_read_csv, mock_path_exists, mock_glob, mock_get_path):
+    def test_load_market_data(self, mock_read_csv):
         """Test loading market data."""
         # Configure mocks
-        mock_get_path.return_value = '/mocked/path/to/scraped_data'
-        mock_glob.return_value = [
-            '/mocked/path/to/scraped_data/market_data_20200101_20250101',
-            '/mocked/path/to/scraped_data/market_data_20200101_20250620'  # Latest
-        ]
-        mock_path_exists.return_value = True
         mock_df = pd.DataFrame({'Date': ['2025-01-01', '2025-01-02'], 'Value': [100, 200]})
         mock_read_csv.return_value = mock_df
         
-        # Call the method
-        result = self.data_processor._load_market_data()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ['market_data_20200101_20250101', 'market_data_20200101_20250620']:
+                os.makedirs(os.path.join(tmp_dir, name))
+                open(os.path.join(tmp_dir, name, 'market_data.csv'), 'w').close()
+            # Directories without a date range in their name are ignored
+            os.makedirs(os.path.join(tmp_dir, 'market_data_backup'))
+            
+            # Call the method
+            processor = DataProcessor(market_data_dir=tmp_dir)
+            result = processor._load_market_data()
+            
+            # Verify the latest directory was used
+            mock_read_csv.assert_called_once()
+            args, kwargs = mock_read_csv.call_args
+            self.assertEqual(
+                args[0], os.path.join(tmp_dir, 'market_data_20200101_20250620', 'market_data.csv')
+            )
+            self.assertEqual(kwargs['parse_dates'], ['Date'])
+            self.assertIsNone(kwargs['usecols'])
         
         # Verify the result
         pd.testing.assert_frame_equal(result, mock_df)
+    
+    def test_load_market_data_required_columns(self):
+        """Test that only the requested market data columns are loaded."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            market_dir = os.path.join(tmp_dir, 'market_data_20200101_20250620')
+            os.makedirs(market_dir)
+            pd.DataFrame({
+                'Date': ['2025-01-03', '2025-01-10'],
+                'CPI': [300.1, 300.2],
+                'GDP': [29000.0, 29100.0]
+            }).to_csv(os.path.join(market_dir, 'market_data.csv'), index=False)
+            
+            # Call the method
+            processor = DataProcessor(market_data_dir=tmp_dir, required_market_cols=['CPI'])
+            result = processor._load_market_data()
         
-        # Verify mocks were called correctly
-        mock_get_path.assert_called_once()
-        mock_glob.assert_called_once()
-        mock_read_csv.assert_called_once_with('/mocked/path/to/scraped_data/market_data_20200101_20250620/market_data.csv')
+        # Verify the result
+        self.assertEqual(list(result.columns), ['Date', 'CPI'])
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(result['Date']))
     
-    @patch('pandas.read_csv')
-    def test_combine_predictions(self, mock_read_csv):
+    def test_combine_predictions(self):
         """Test combining prediction files."""
-        # Configure the mock for multiple calls
-        mock_df1 = pd.DataFrame({'Date': ['2025-01-01'], 'Value': [100]})
-        mock_df2 = pd.DataFrame({'Date': ['2025-01-02'], 'Value': [200]})
-        mock_read_csv.side_effect = [mock_df1, mock_df2]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file1 = os.path.join(tmp_dir, 'file1.csv')
+            file2 = os.path.join(tmp_dir, 'file2.csv')
+            pd.DataFrame({'Date': ['2025-01-01'], 'ticker': ['AAPL'], 'actual': [100.0]}).to_csv(file1, index=False)
+            pd.DataFrame({'Date': ['2025-01-02'], 'ticker': ['MSFT'], 'actual': [200.0]}).to_csv(file2, index=False)
+            
+            # Call the method
+            result = self.data_processor._combine_predictions([file1, file2])
         
-        # Call the method
-        result = self.data_processor._combine_predictions([
-            '/mocked/path/file1.csv', 
-            '/mocked/path/file2.csv'
-        ])
+        # Verify the result
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result.iloc[0]['actual'], 100)
+        self.assertEqual(result.iloc[1]['actual'], 200)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(result['Date']))
+    
+    @patch('src.data_preparation.data_processor.DataProcessor._concatenate_prediction_files')
+    def test_combine_single_prediction_file(self, mock_concatenate):
+        """Test that a single prediction file is read without concatenation."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file1 = os.path.join(tmp_dir, 'file1.csv')
+            pd.DataFrame({'Date': ['2025-01-01'], 'ticker': ['AAPL'], 'actual': [100.0]}).to_csv(file1, index=False)
+            
+            # Call the method
+            result = self.data_processor._combine_predictions([file1])
+        
+        # Verify the result
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result.iloc[0]['ticker'], 'AAPL')
+        mock_concatenate.assert_not_called()
+    
+    def test_combine_predictions_different_headers(self):
+        """Test combining prediction files whose columns differ."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file1 = os.path.join(tmp_dir, 'file1.csv')
+            file2 = os.path.join(tmp_dir, 'file2.csv')
+            pd.DataFrame({'Date': ['2025-01-01'], 'ticker': ['AAPL'], 'actual': [100.0]}).to_csv(file1, index=False)
+            pd.DataFrame({'Date': ['2025-01-02'], 'ticker': ['MSFT'], 'SARIMA_pred': [210.0],
+                          'actual': [200.0]}).to_csv(file2, index=False)
+            
+            # Call the method
+            result = self.data_processor._combine_predictions([file1, file2])
         
         # Verify the result
         self.assertEqual(len(result), 2)
-        self.assertEqual(result.iloc[0]['Value'], 100)
-        self.assertEqual(result.iloc[1]['Value'], 200)
+        self.assertIn('SARIMA_pred', result.columns)
+        self.assertTrue(pd.isna(result.iloc[0]['SARIMA_pred']))
+        self.assertEqual(result.iloc[1]['SARIMA_pred'], 210)
+    
+    def test_combine_predictions_cached(self):
+        """Test that unchanged prediction files are not parsed again."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file1 = os.path.join(tmp_dir, 'file1.csv')
+            pd.DataFrame({'Date': ['2025-01-01'], 'ticker': ['AAPL'], 'actual': [100.0]}).to_csv(file1, index=False)
+            
+            first = self.data_processor._combine_predictions([file1])
+            with patch.object(DataProcessor, '_parse_prediction_csv') as mock_parse:
+                second = DataProcessor()._combine_predictions([file1])
+                mock_parse.assert_not_called()
+            pd.testing.assert_frame_equal(first, second)
+            
+            # A changed file is read again
+            pd.DataFrame({'Date': ['2025-01-01', '2025-01-08'], 'ticker': ['AAPL', 'AAPL'],
+                          'actual': [100.0, 110.0]}).to_csv(file1, index=False)
+            result = self.data_processor._combine_predictions([file1])
         
-        # Verify mock was called correctly
-        self.assertEqual(mock_read_csv.call_count, 2)
+        self.assertEqual(len(result), 2)
     
     def test_merge_with_market_data(self):
         """Test merging predictions with market data."""
@@ -121,5 +192,46 @@ class TestDataProcessor(unittest.TestCase):
         self.assertEqual(result.iloc[0]['prediction'], 150)
         self.assertEqual(result.iloc[0]['price'], 100)
 
+    def test_downcast_numeric_lossless(self):
+        """Test that only float columns representable in float32 are downcast."""
+        df = pd.DataFrame({
+            'exact': [1.5, 2.25, np.nan],
+            'precise': [15623.456789, 15700.123456, 15800.987654],
+            'count': [1, 2, 3]
+        })
+        
+        result = self.data_processor._downcast_numeric(df)
+        
+        self.assertEqual(result['exact'].dtype, np.float32)
+        self.assertEqual(result['precise'].dtype, np.float64)
+        self.assertEqual(result['precise'].iloc[0], 15623.456789)
+        self.assertEqual(result['count'].dtype, np.int8)
+    
+    def test_save_combined_data_csv_format(self):
+        """Test that the saved CSV is written in the pandas format and the Parquet sidecar round-trips."""
+        df = pd.DataFrame({
+            'Date': pd.to_datetime(['2025-01-03', '2025-01-10']),
+            'ticker': ['AAPL', 'MSFT'],
+            'Actual': [1.0, 1e-07]
+        })
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, 'combined.csv')
+            parquet_path = self.data_processor._save_combined_data(df, csv_path)
+            
+            with open(csv_path) as f:
+                self.assertEqual(f.read(), df.to_csv(index=False))
+            pd.testing.assert_frame_equal(pd.read_parquet(parquet_path), df)
+    
+    def test_get_second_latest_date(self):
+        """Test that the second latest distinct date is returned."""
+        df = pd.DataFrame({
+            'Date': pd.to_datetime(['2025-01-03', '2025-01-10', '2025-01-10', '2025-01-03']),
+            'ticker': ['AAPL', 'AAPL', 'MSFT', 'MSFT']
+        })
+        
+        self.assertEqual(self.data_processor._get_second_latest_date(df), '20250103')
+        self.assertEqual(self.data_processor._get_second_latest_date(df.iloc[1:3]), '20250110')
+
 if __name__ == '__main__':
     unittest.main()
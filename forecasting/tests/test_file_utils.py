@@ -0,0 +1,69 @@
+"""
+Unit tests for the file utility functions.
+"""
+
+import os
+import unittest
+import sys
+import tempfile
+from datetime import date
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the module under test
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.file_utils import find_latest_file, clean_old_files, get_next_friday
+
+
+class TestFileUtils(unittest.TestCase):
+    """Test cases for the file utility functions."""
+
+    def test_find_latest_file(self):
+        """Test that the file with the highest trailing number is returned."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for date in ['20250606', '20250620', '20250613']:
+                open(os.path.join(tmp_dir, f'combined_data_until_{date}.csv'), 'w').close()
+            open(os.path.join(tmp_dir, 'notes.txt'), 'w').close()
+
+            result = find_latest_file(tmp_dir, 'combined_data_until_*.csv')
+
+        self.assertEqual(os.path.basename(result), 'combined_data_until_20250620.csv')
+
+    def test_find_latest_file_missing(self):
+        """Test that a FileNotFoundError is raised when nothing matches."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(FileNotFoundError):
+                find_latest_file(tmp_dir, 'combined_data_until_*.csv')
+
+    def test_clean_old_files(self):
+        """Test that only files matching the pattern are removed."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ['predictions_20250620.json', 'predictions_20250627.json', 'keep.json']:
+                open(os.path.join(tmp_dir, name), 'w').close()
+            os.mkdir(os.path.join(tmp_dir, 'predictions_dir.json'))
+
+            clean_old_files(tmp_dir, 'predictions_*.json')
+
+            self.assertEqual(sorted(os.listdir(tmp_dir)), ['keep.json', 'predictions_dir.json'])
+
+    def test_clean_old_files_missing_directory(self):
+        """Test that a missing directory is ignored."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            clean_old_files(os.path.join(tmp_dir, 'missing'), 'predictions_*.json')
+
+    @patch('src.utils.file_utils.date')
+    def test_get_next_friday(self, mock_date):
+        """Test that the next Friday is strictly after today."""
+        cases = {
+            date(2025, 6, 16): '20250620',  # Monday
+            date(2025, 6, 19): '20250620',  # Thursday
+            date(2025, 6, 20): '20250627',  # Friday
+            date(2025, 6, 22): '20250627',  # Sunday
+        }
+        for today, expected in cases.items():
+            mock_date.today.return_value = today
+            self.assertEqual(get_next_friday(), expected, f"Wrong next Friday for {today}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,13 +7,17 @@ import unittest
 from unittest.mock import patch, MagicMock, mock_open
 import pandas as pd
 import numpy as np
+import scipy.sparse as sp
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.linear_model import LinearRegression
 import json
 import sys
+import tempfile
 
 # Add the parent directory to the path so we can import the module under test
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.modeling.model_trainer import ModelTrainer
+from src.modeling.model_trainer import ModelTrainer, LINEAR_MODELS, NONLINEAR_MODELS
 
 
 class TestModelTrainer(unittest.TestCase):
@@ -24,7 +28,8 @@ class TestModelTrainer(unittest.TestCase):
         self.trainer = ModelTrainer(
             data_dir='test_data',
             output_dir='test_output',
-            random_state=42
+            random_state=42,
+            cache_cv=False
         )
     
     def test_initialize_models(self):
@@ -32,10 +37,30 @@ class TestModelTrainer(unittest.TestCase):
         models = self.trainer._initialize_models()
         
         # Verify models were created
-        self.assertEqual(len(models), 10, "Should initialize 10 different models")
-        self.assertIn("Random Forest", models, "Random Forest model should be initialized")
-        self.assertIn("Gradient Boosting", models, "Gradient Boosting model should be initialized")
+        self.assertEqual(len(models), 6, "Should initialize 6 different models by default")
+        self.assertNotIn("Random Forest", models, "Random Forest should only be in the full set")
+        self.assertIn("Hist Gradient Boosting", models, "Hist Gradient Boosting model should be initialized")
         self.assertIn("Linear Regression", models, "Linear Regression model should be initialized")
+        self.assertNotIn("Ridge Regression", models, "Ridge Regression should only be in the full set")
+    
+    def test_initialize_models_full(self):
+        """Test that the full model set includes every regressor."""
+        trainer = ModelTrainer(data_dir='test_data', output_dir='test_output', model_set='full',
+                               cache_cv=False)
+        models = trainer._initialize_models()
+        
+        self.assertEqual(len(models), 9, "Should initialize 9 different models")
+        self.assertIn("Ridge Regression", models, "Ridge Regression model should be initialized")
+        self.assertIn("Hist Gradient Boosting", models, "Hist Gradient Boosting model should be initialized")
+        self.assertIn("Extra Trees", models, "Extra Trees model should be initialized")
+    
+    def test_initialize_models_large_dataset(self):
+        """Test that super-linear models are skipped on large datasets."""
+        models = self.trainer._initialize_models(n_samples=10000)
+        
+        self.assertNotIn("Support Vector Regression", models, "SVR should be skipped")
+        self.assertNotIn("K-Neighbors", models, "K-Neighbors should be skipped")
+        self.assertIn("Hist Gradient Boosting", models, "Hist Gradient Boosting model should be initialized")
     
     @patch('src.modeling.model_trainer.find_latest_file')
     @patch('pandas.read_csv')
@@ -67,7 +92,30 @@ class TestModelTrainer(unittest.TestCase):
         
         # Verify mocks were called correctly
         mock_find_latest.assert_called_once_with('test_data', 'combined_data_until_*.csv')
-        mock_read_csv.assert_called_once_with('test_data/combined_data.csv')
+        mock_read_csv.assert_called_once_with(
+            'test_data/combined_data.csv', engine='pyarrow', dtype={'ticker': 'category'})
+    
+    @patch('src.modeling.model_trainer.find_latest_file')
+    @patch('pandas.read_csv')
+    def test_load_data_in_memory(self, mock_read_csv, mock_find_latest):
+        """Test that in-memory data is used without reading a file."""
+        df = pd.DataFrame({
+            'Date': pd.to_datetime(['2025-01-01', '2025-01-02', '2025-01-03']),
+            'ticker': ['AAPL', 'MSFT', 'GOOGL'],
+            'feature1': [1.0, 2.0, 3.0],
+            'actual': [100.0, 200.0, np.NaN]
+        })
+        trainer = ModelTrainer(data_dir='test_data', output_dir='test_output', data=df, cache_cv=False)
+        
+        # Call the method
+        train_df, test_df = trainer._load_data()
+        
+        # Verify results
+        self.assertEqual(len(train_df), 2, "Training data should have 2 rows")
+        self.assertEqual(len(test_df), 1, "Test data should have 1 row")
+        self.assertIn('Date', df.columns, "Caller's frame should be left intact")
+        mock_find_latest.assert_not_called()
+        mock_read_csv.assert_not_called()
     
     def test_preprocess_data(self):
         """Test data preprocessing."""
@@ -80,21 +128,66 @@ class TestModelTrainer(unittest.TestCase):
         })
         
         # Call the method
-        X_processed, y, categorical_cols, numerical_cols = self.trainer._preprocess_data(df)
+        X, y, categorical_cols, numerical_cols = self.trainer._preprocess_data(df)
         
         # Verify results
-        self.assertEqual(X_processed.shape[0], 3, "Should have 3 processed rows")
+        self.assertEqual(X.shape[0], 3, "Should have 3 rows")
+        self.assertNotIn('actual', X.columns, "Target should not be a feature")
         self.assertEqual(len(y), 3, "Target vector should have 3 values")
+        self.assertEqual(y.dtype, np.float32, "Target should be float32")
         self.assertEqual(categorical_cols, ['ticker'], "Should identify 'ticker' as categorical")
         self.assertEqual(set(numerical_cols), set(['feature1', 'feature2']), 
                        "Should identify numerical features correctly")
         
-        # Encoder and scaler should have been fitted
-        self.assertIsNotNone(self.trainer.encoder, "Encoder should be fitted")
-        self.assertIsNotNone(self.trainer.scaler, "Scaler should be fitted")
+        # The pipeline preprocessing should yield contiguous float32 features
+        pipeline = self.trainer._make_pipeline(LinearRegression())
+        X_processed = pipeline[:-1].fit_transform(X)
+        self.assertEqual(X_processed.shape, (3, 5), "Should have 2 scaled + 3 one-hot columns")
+        self.assertEqual(X_processed.dtype, np.float32, "Features should be float32")
+        self.assertTrue(X_processed.flags['C_CONTIGUOUS'], "Features should be C-contiguous")
+    
+    def test_preprocess_data_categorical_ticker(self):
+        """Test that a categorical ticker column is one-hot encoded."""
+        df = pd.DataFrame({
+            'ticker': pd.Categorical(['AAPL', 'MSFT', 'GOOGL']),
+            'feature1': [1.0, 2.0, 3.0],
+            'actual': [100.0, 200.0, 300.0]
+        })
+        
+        X, _, categorical_cols, numerical_cols = self.trainer._preprocess_data(df)
+        X_processed = self.trainer.preprocessor.fit_transform(X)
+        
+        self.assertEqual(categorical_cols, ['ticker'], "Should identify categorical 'ticker'")
+        self.assertEqual(numerical_cols, ['feature1'])
+        self.assertEqual(X_processed.shape, (3, 4), "Should have 1 scaled + 3 one-hot columns")
+        self.assertEqual(X_processed.dtype, np.float32, "Columns should be stacked as float32")
+    
+    def test_preprocess_data_sparse(self):
+        """Test that many one-hot columns keep the feature matrix sparse."""
+        tickers = [f'T{i}' for i in range(10)]
+        df = pd.DataFrame({
+            'ticker': tickers,
+            'feature1': np.arange(10.0),
+            'actual': np.arange(10.0) * 100
+        })
+        
+        X, y, categorical_cols, numerical_cols = self.trainer._preprocess_data(df)
+        pipeline = self.trainer._make_pipeline(LinearRegression()).fit(X, y)
+        X_processed = pipeline[:-1].transform(X)
+        X_test = self.trainer._preprocess_test_data(df, categorical_cols, numerical_cols)
+        
+        self.assertTrue(sp.issparse(X_processed), "Features should be sparse")
+        self.assertEqual(X_processed.dtype, np.float32, "Features should be float32")
+        self.assertEqual(X_processed.shape, (10, 11))
+        self.assertEqual(list(X_test.columns), list(X.columns), "Test features should match training columns")
+        self.assertEqual(pipeline.predict(X_test).shape, (10,))
+        
+        # HistGradientBoosting does not accept sparse input
+        pipeline = self.trainer._make_pipeline(HistGradientBoostingRegressor())
+        self.assertFalse(sp.issparse(pipeline[:-1].fit_transform(X)), "Features should be dense")
     
     @patch('src.modeling.model_trainer.ModelTrainer._initialize_models')
-    @patch('sklearn.model_selection.cross_val_score')
+    @patch('src.modeling.model_trainer.cross_validate')
     def test_evaluate_models(self, mock_cross_val, mock_init_models):
         """Test model evaluation."""
         # Configure mocks
@@ -104,20 +197,26 @@ class TestModelTrainer(unittest.TestCase):
         }
         mock_init_models.return_value = mock_models
         
-        # Mock cross_val_score to return different values for different models
+        # Mock cross_validate to return different values for different models
         mock_cross_val.side_effect = [
-            np.array([-0.1, -0.2, -0.15, -0.12, -0.18]),  # Model1 MAE
-            np.array([0.85, 0.82, 0.88, 0.84, 0.86]),     # Model1 R2
-            np.array([-0.2, -0.3, -0.25, -0.22, -0.28]),  # Model2 MAE
-            np.array([0.75, 0.72, 0.78, 0.74, 0.76])      # Model2 R2
+            {
+                'test_mae': np.array([-0.1, -0.2, -0.15, -0.12, -0.18]),  # Model1 MAE
+                'test_r2': np.array([0.85, 0.82, 0.88, 0.84, 0.86]),      # Model1 R2
+                'estimator': ['fold-model-1'] * 5
+            },
+            {
+                'test_mae': np.array([-0.2, -0.3, -0.25, -0.22, -0.28]),  # Model2 MAE
+                'test_r2': np.array([0.75, 0.72, 0.78, 0.74, 0.76]),      # Model2 R2
+                'estimator': ['fold-model-2'] * 5
+            }
         ]
         
         # Create test data
-        X = np.array([[1, 2], [3, 4], [5, 6]])
-        y = np.array([10, 20, 30])
+        df = pd.DataFrame({'feature1': [1.0, 3.0, 5.0], 'feature2': [2.0, 4.0, 6.0], 'actual': [10.0, 20.0, 30.0]})
+        X, y, _, _ = self.trainer._preprocess_data(df)
         
         # Call the method
-        results = self.trainer._evaluate_models(X, y)
+        results, fold_estimators = self.trainer._evaluate_models(X, y)
         
         # Verify results
         self.assertEqual(len(results), 2, "Should evaluate 2 models")
@@ -129,43 +228,128 @@ class TestModelTrainer(unittest.TestCase):
         model1_row = results[results['model'] == 'Model1'].iloc[0]
         self.assertLess(model1_row['mean_mae'], 0.2, "Model1 should have MAE < 0.2")
         
-        # Verify cross_val_score was called correctly
-        self.assertEqual(mock_cross_val.call_count, 4, "cross_val_score should be called 4 times")
-    
-    @patch('os.makedirs')
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('json.dump')
-    @patch('src.modeling.model_trainer.clean_old_files')
-    @patch('src.modeling.model_trainer.get_next_friday')
-    def test_save_predictions(self, mock_next_friday, mock_clean, mock_json_dump, 
-                             mock_open_file, mock_makedirs):
-        """Test saving predictions to JSON."""
-        # Configure mocks
-        mock_next_friday.return_value = '20250704'
+        # Fitted fold estimators should be returned for selection
+        self.assertEqual(fold_estimators, {'Model1': ['fold-model-1'] * 5, 'Model2': ['fold-model-2'] * 5},
+                         "Fold estimators should be returned")
+        mock_init_models.assert_called_once()
         
-        # Create test data
-        test_df = pd.DataFrame({
-            'ticker': ['AAPL', 'MSFT', 'GOOGL'],
-            'prediction': [150.5, 250.75, 1800.25]
+        # Models should be evaluated wrapped in the preprocessing pipeline
+        pipeline = mock_cross_val.call_args_list[0][0][0]
+        self.assertIs(pipeline[-1], mock_models['Model1'])
+        self.assertIs(pipeline[0], self.trainer.preprocessor)
+        
+        # The best model should average its fold estimators
+        best_name, best_model = self.trainer._select_best_model(results, fold_estimators)
+        self.assertEqual(best_name, 'Model1', "Model1 should be selected")
+        self.assertEqual(best_model.estimators, ['fold-model-1'] * 5)
+        
+        # Verify cross_validate was called once per model
+        self.assertEqual(mock_cross_val.call_count, 2, "cross_validate should be called once per model")
+    
+    @patch('src.modeling.model_trainer.ModelTrainer._initialize_models')
+    @patch('src.modeling.model_trainer.cross_validate')
+    def test_evaluate_models_cached(self, mock_cross_val, mock_init_models):
+        """Test that cross-validation results are reused for unchanged data."""
+        mock_init_models.side_effect = lambda n_samples=None: {'Model1': 'model-1'}
+        mock_cross_val.return_value = {
+            'test_mae': np.array([-0.1, -0.2]),
+            'test_r2': np.array([0.8, 0.9]),
+            'estimator': ['fold-model-1', 'fold-model-1']
+        }
+        df = pd.DataFrame({
+            'feature1': [1.0, 3.0, 5.0, 7.0],
+            'feature2': [2.0, 4.0, 6.0, 8.0],
+            'actual': [10.0, 20.0, 30.0, 40.0]
         })
         
-        # Call the method
-        result = self.trainer._save_predictions(test_df)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            trainer = ModelTrainer(data_dir='test_data', output_dir=tmp_dir, n_cv_folds=2, cache_cv=True)
+            X, y, _, _ = trainer._preprocess_data(df)
+            
+            first, _ = trainer._evaluate_models(X, y)
+            second, _ = trainer._evaluate_models(X, y)
+            self.assertEqual(mock_cross_val.call_count, 1, "Second evaluation should hit the cache")
+            pd.testing.assert_frame_equal(first, second)
+            
+            # Changed data is evaluated again
+            trainer._evaluate_models(X, y + 1)
+            self.assertEqual(mock_cross_val.call_count, 2, "Changed data should be re-evaluated")
+            
+            # Clearing the cache forces a re-evaluation
+            trainer.clear_cache()
+            trainer._evaluate_models(X, y)
+            self.assertEqual(mock_cross_val.call_count, 3, "Cleared cache should be re-evaluated")
+    
+    def test_cv_cache_disabled_by_default(self):
+        """Test that no on-disk cross-validation cache is used unless requested."""
+        trainer = ModelTrainer(data_dir='test_data', output_dir='test_output')
+        self.assertIsNone(trainer.memory.location)
+    
+    def test_screen_models(self):
+        """Test that the screen picks the family matching the target's shape."""
+        rng = np.random.default_rng(0)
+        feature = rng.uniform(-1, 1, 200)
         
-        # Verify results
-        expected_path = os.path.join('test_output', 'next_friday_predictions_20250704.json')
-        self.assertEqual(result, expected_path, "Should return the correct output path")
+        # A linear target favours the linear models
+        df = pd.DataFrame({'feature1': feature, 'actual': 3 * feature + rng.normal(0, 0.01, 200)})
+        X, y, _, _ = self.trainer._preprocess_data(df)
+        self.assertIn("Lasso Regression", self.trainer._screen_models(X, y))
         
-        # Verify mocks were called correctly
-        mock_clean.assert_called_once()
-        mock_makedirs.assert_called_once_with('test_output', exist_ok=True)
-        mock_open_file.assert_called_once_with(expected_path, 'w')
+        # A step target favours the non-linear models
+        df['actual'] = np.where(feature > 0, 10.0, -10.0)
+        X, y, _, _ = self.trainer._preprocess_data(df)
+        self.assertIn("Hist Gradient Boosting", self.trainer._screen_models(X, y))
+    
+    def test_screen_families_cover_fast_models(self):
+        """Test that every model of the fast set can be selected by the screen."""
+        trainer = ModelTrainer(data_dir='test_data', output_dir='test_output', model_set='fast')
+        families = set(LINEAR_MODELS) | set(NONLINEAR_MODELS)
+        for name in trainer._initialize_models():
+            self.assertIn(name, families, f"{name} is never cross-validated in the fast set")
+    
+    @patch('src.modeling.model_trainer.ModelTrainer._initialize_models')
+    @patch('src.modeling.model_trainer.cross_validate')
+    def test_evaluate_models_subset(self, mock_cross_val, mock_init_models):
+        """Test that only the requested models are evaluated."""
+        mock_init_models.return_value = {'Model1': MagicMock(), 'Model2': MagicMock()}
+        mock_cross_val.return_value = {
+            'test_mae': np.array([-0.1, -0.2]),
+            'test_r2': np.array([0.8, 0.9]),
+            'estimator': ['fold-model-1', 'fold-model-1']
+        }
+        df = pd.DataFrame({'feature1': [1.0, 3.0, 5.0], 'actual': [10.0, 20.0, 30.0]})
+        X, y, _, _ = self.trainer._preprocess_data(df)
+        
+        results, fold_estimators = self.trainer._evaluate_models(X, y, ('Model2',))
+        
+        self.assertEqual(results['model'].tolist(), ['Model2'], "Only Model2 should be evaluated")
+        self.assertEqual(list(fold_estimators), ['Model2'])
+        self.assertEqual(mock_cross_val.call_count, 1)
+    
+    @patch('src.modeling.model_trainer.clean_old_files')
+    def test_save_predictions(self, mock_clean):
+        """Test saving predictions to JSON."""
+        # Create test data
+        predictions = {'AAPL': np.float32(150.5), 'MSFT': 250.75, 'GOOGL': 1800.25}
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.trainer.output_dir = tmp_dir
+            
+            # Call the method
+            result = self.trainer._save_predictions(predictions, '20250704')
+            
+            # Verify results
+            expected_path = os.path.join(tmp_dir, 'next_friday_predictions.json')
+            self.assertEqual(result, expected_path, "Should return the correct output path")
+            mock_clean.assert_called_once_with(tmp_dir, 'next_friday_predictions.json')
+            
+            # Verify JSON was written with the correct data
+            with open(expected_path) as f:
+                saved = json.load(f)
         
-        # Verify JSON was written with the correct data
         expected_dict = {'AAPL': 150.5, 'MSFT': 250.75, 'GOOGL': 1800.25}
-        mock_json_dump.assert_called_once()
-        args, _ = mock_json_dump.call_args
-        self.assertEqual(args[0], expected_dict, "Should write the correct predictions dict")
+        self.assertEqual(saved['prediction_date'], '20250704', "Should write the prediction date")
+        self.assertEqual(saved['predictions'], expected_dict, "Should write the correct predictions dict")
 
 if __name__ == '__main__':
     unittest.main()
@@ -17,11 +17,13 @@ SCRAPED_DATA_DIR = SCRAPING_DIR / 'scraped_data'
 MODEL_CONFIG_PATH = CONFIG_DIR / 'model_config.json'
 SARIMA_CACHE_DIR = CACHE_DIR / 'sarima_params'
 TIMEMOE_CACHE_DIR = CACHE_DIR / 'time_moe_cache'
+AUTOTS_CACHE_DIR = CACHE_DIR / 'autots_templates'
 
 # Default parameters
 DEFAULT_LOG_LEVEL = 'INFO'
 DEFAULT_TEST_SIZE = 0.2
 DEFAULT_PREDICTION_STEPS = 1
+DEFAULT_SARIMA_REFIT_INTERVAL = 13  # Weeks between SARIMA re-estimations in backtests (0 disables)
 
 # Model names
 MODEL_SARIMA = 'SARIMA'
@@ -31,3 +33,6 @@ MODEL_TIMEMOE = 'TimeMOE'
 # Date format for filenames
 DATE_FORMAT = '%Y%m%d'
 TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+
+# Write buffer for prediction CSVs, so each file is written in a few large chunks
+CSV_WRITE_BUFFER_SIZE = 1 << 20
@@ -1,89 +1,149 @@
 """AutoTS time series forecasting model implementation."""
 import logging
-import pandas as pd
-import numpy as np
 import os
-import sys
+import contextlib
+import gc
 from autots import AutoTS
 from .base_model import BaseTimeSeriesModel
+from ..config.constants import AUTOTS_CACHE_DIR
+
+# Search results kept by AutoTS after fitting that predict() never reads
+AUTOTS_SEARCH_ATTRS = ('initial_results', 'validation_results', 'score_per_series')
 
 
 class AutoTSPredictor(BaseTimeSeriesModel):
     """AutoTS model for time series forecasting."""
     
-    def __init__(self, log_level=logging.INFO):
+    def __init__(self, cache_dir=None, log_level=logging.INFO):
         """Initialize the AutoTS model.
         
         Args:
+            cache_dir: Directory to cache the best model template per ticker
             log_level: Logging level
         """
         super().__init__(log_level)
         self.model = None
         self.forecast = None
+        self._fallback_value = None
+        # Ticker the fitted model was selected for, so its data can be swapped
+        self._fitted_ticker = None
+        self.cache_dir = cache_dir or AUTOTS_CACHE_DIR
+        
+        # Ensure cache directory exists
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def _get_template_filepath(self, ticker):
+        """Get the path to the cached best model template for a ticker.
+        
+        Args:
+            ticker: Company ticker symbol
+            
+        Returns:
+            Path to cached template file
+        """
+        return os.path.join(self.cache_dir, f"{ticker}_autots.csv")
         
-    def train(self, data, **kwargs):
+    def train(self, data, ticker=None, force_retrain=False, **kwargs):
         """Train the AutoTS model.
         
+        The first training for a ticker runs the full model search and caches the
+        best template; later trainings only refit that template. When this
+        instance is already fitted for the ticker, the new data is simply loaded
+        and the best model is refit on it at prediction time, skipping the
+        template's holdout evaluation.
+        
         Args:
             data: DataFrame with Date and Weekly_Close columns
+            ticker: Company ticker symbol for template caching
+            force_retrain: Whether to run the model search even if a cached template exists
             
         Returns:
             None
         """
         data = self._validate_data(data)
         
-        # Store original data for fallback predictions if needed
-        self.data = data.copy()
+        # Moving average of the last 5 values, used if AutoTS fails to predict
+        self._fallback_value = float(data['Weekly_Close'].iloc[-5:].mean())
         
         self.logger.info("Preparing data for AutoTS model...")
         
         try:
-            # Create a copy to avoid modifying the original
-            df = data.copy()
-            
-            # Ensure data is properly formatted
-            df['Date'] = pd.to_datetime(df['Date'])
-            df = df.sort_values('Date')
+            # _validate_data already guarantees a sorted datetime Date column and
+            # AutoTS does not modify its input, so the frame is passed as is
+            if (ticker is not None and not force_retrain and self.model is not None
+                    and self._fitted_ticker == ticker):
+                self.logger.info(f"Loading new data into the fitted AutoTS model for {ticker}...")
+                with open(os.devnull, 'w') as devnull, \
+                        contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+                    self.model.fit_data(data, date_col='Date', value_col='Weekly_Close')
+                # Force predict() to refit the best model on the new data
+                self.model.model = None
+                return
             
-            self.logger.info("Training AutoTS model...")
+            self._fitted_ticker = None
+            template_filepath = self._get_template_filepath(ticker) if ticker else None
+            use_template = (template_filepath is not None and not force_retrain
+                            and os.path.exists(template_filepath))
             
-            # Initialize and train the model with reasonable defaults
-            self.model = AutoTS(
-                forecast_length=1,
-                frequency='W',  # Weekly data
-                ensemble=None,
-                model_list="superfast",  # Using faster model set
-                transformer_list="superfast",
-                max_generations=4,
-                num_validations=2,
-                validation_method="backwards",
-                verbose=0  # Suppress AutoTS's own prints
-            )
+            if use_template:
+                # Skip the search and only refit the cached best model
+                self.logger.info(f"Training AutoTS model from cached template for {ticker}...")
+                self.model = AutoTS(
+                    forecast_length=1,
+                    frequency='W',  # Weekly data
+                    ensemble=None,
+                    model_list="superfast",
+                    max_generations=0,
+                    num_validations=0,
+                    verbose=0  # Suppress AutoTS's own prints
+                ).import_template(template_filepath, method='only')
+            else:
+                self.logger.info("Training AutoTS model...")
+                
+                # Initialize and train the model with reasonable defaults
+                self.model = AutoTS(
+                    forecast_length=1,
+                    frequency='W',  # Weekly data
+                    ensemble=None,
+                    model_list="superfast",  # Using faster model set
+                    transformer_list="superfast",
+                    max_generations=4,
+                    num_validations=2,
+                    validation_method="backwards",
+                    verbose=0  # Suppress AutoTS's own prints
+                )
             
             self.logger.info("Fitting AutoTS model...")
             
-            # Suppress verbose output from AutoTS during fitting
-            original_stdout = sys.stdout
-            original_stderr = sys.stderr
-            sys.stdout = open(os.devnull, 'w')
-            sys.stderr = open(os.devnull, 'w')
-            
-            try:
+            # Suppress verbose output from AutoTS during fitting; the streams are
+            # restored and the file closed even if fitting raises
+            with open(os.devnull, 'w') as devnull, \
+                    contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
                 self.model = self.model.fit(
-                    df,
+                    data,
                     date_col='Date',  # Use the Date column directly
                     value_col='Weekly_Close'
                 )
-            finally:
-                sys.stdout.close()
-                sys.stderr.close()
-                sys.stdout = original_stdout
-                sys.stderr = original_stderr
+            
+            # Cache the best model found by the search for later trainings
+            if template_filepath is not None and not use_template:
+                self.logger.info(f"Saving best AutoTS template for {ticker} to cache")
+                self.model.export_template(
+                    template_filepath, models='best', n=1, max_per_model_class=1
+                )
+            
+            # Prediction only needs the best model, so drop the evaluated
+            # population to keep memory flat across rolling windows
+            for attr in AUTOTS_SEARCH_ATTRS:
+                setattr(self.model, attr, None)
+            gc.collect()
+            self._fitted_ticker = ticker
             self.logger.info("AutoTS model training complete")
         
         except Exception as e:
             self.logger.error(f"Error in AutoTS model training: {str(e)}")
             self.model = None
+            self._fitted_ticker = None
     
     def predict(self, steps=1, **kwargs):
         """Generate predictions using the trained AutoTS model.
@@ -116,8 +176,6 @@ class AutoTSPredictor(BaseTimeSeriesModel):
             self.logger.error(f"Error in AutoTS prediction: {str(e)}")
             # Fallback to a simple prediction method if AutoTS fails
             self.logger.info("Using fallback prediction method")
-            if hasattr(self, 'data') and self.data is not None:
-                # Simple moving average fallback
-                last_values = self.data['Weekly_Close'].values[-5:]  # Use last 5 values
-                return float(np.mean(last_values))
+            if self._fallback_value is not None:
+                return self._fallback_value
             raise
@@ -69,6 +69,11 @@ class BaseTimeSeriesModel(ABC):
         if missing_cols:
             raise ValueError(f"Input data is missing required columns: {missing_cols}")
             
+        # Nothing to do for data that is already parsed and sorted, as in
+        # rolling-window training where the same history is validated repeatedly
+        if pd.api.types.is_datetime64_any_dtype(data['Date']) and data['Date'].is_monotonic_increasing:
+            return data
+            
         # Ensure Date column is datetime
         if not pd.api.types.is_datetime64_any_dtype(data['Date']):
             data['Date'] = pd.to_datetime(data['Date'])
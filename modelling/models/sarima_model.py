@@ -1,16 +1,19 @@
 """SARIMA time series forecasting model implementation."""
-import os
-import json
 import logging
 import warnings
+import numpy as np
 import pandas as pd
-import pmdarima as pm
+from statsforecast.models import ARIMA, AutoARIMA
 from .base_model import BaseTimeSeriesModel
+from .sarima_param_store import SarimaParamStore
 from ..config.constants import SARIMA_CACHE_DIR
 
-# Suppress statsmodels and pmdarima warnings
+# Suppress statsmodels and statsforecast warnings
 warnings.filterwarnings('ignore')
 
+# Weekly seasonality
+SEASON_LENGTH = 52
+
 
 class SARIMAPredictor(BaseTimeSeriesModel):
     """SARIMA model for time series forecasting."""
@@ -19,28 +22,53 @@ class SARIMAPredictor(BaseTimeSeriesModel):
         """Initialize the SARIMA model.
         
         Args:
-            cache_dir: Directory to cache model parameters
+            cache_dir: Directory to cache model parameters and fitted models
             log_level: Logging level
         """
         super().__init__(log_level)
         self.model = None
         self.order = None
         self.seasonal_order = None
+        # Latest series, and whether predict() must apply the fitted model to it
+        # (after reusing a cached model or update()) rather than forecast from the fit
+        self.series = None
+        self._apply_to_series = False
+        self._state_ticker = None
+        # Length of the series the current coefficients were estimated on
+        self._fitted_n_obs = None
         self.cache_dir = cache_dir or SARIMA_CACHE_DIR
         
-        # Ensure cache directory exists
-        os.makedirs(self.cache_dir, exist_ok=True)
+        # Per-ticker orders and fitted models
+        self.store = SarimaParamStore(self.cache_dir)
     
-    def _get_params_filepath(self, ticker):
-        """Get the path to the cached parameters file for a ticker.
+    def _save_state(self, ticker):
+        """Persist the orders and fitted model so later training calls can skip estimation.
         
         Args:
             ticker: Company ticker symbol
-            
-        Returns:
-            Path to cached parameters file
         """
-        return os.path.join(self.cache_dir, f"{ticker}_params.json")
+        self.store.put(ticker, self.order, self.seasonal_order, self.model, self._fitted_n_obs)
+        self._state_ticker = ticker
+    
+    def _set_orders_from_model(self):
+        """Read the (p, d, q) and (P, D, Q, m) orders from the fitted model."""
+        # arma holds (p, q, P, Q, m, d, D)
+        p, q, P, Q, m, d, D = map(int, self.model.model_['arma'])
+        self.order = (p, d, q)
+        self.seasonal_order = (P, D, Q, m)
+    
+    def _fit_orders(self, values):
+        """Estimate the coefficients for the current orders without an order search.
+        
+        Args:
+            values: Array of Weekly_Close values
+        """
+        self.model = ARIMA(
+            order=self.order,
+            season_length=self.seasonal_order[3],
+            seasonal_order=self.seasonal_order[:3]
+        ).fit(values)
+        self._fitted_n_obs = len(values)
     
     def train(self, data, ticker=None, force_retrain=False):
         """Train the SARIMA model.
@@ -48,7 +76,7 @@ class SARIMAPredictor(BaseTimeSeriesModel):
         Args:
             data: DataFrame with Date and Weekly_Close columns or a Series
             ticker: Company ticker symbol for parameter caching
-            force_retrain: Whether to force retraining even if cached parameters exist
+            force_retrain: Whether to force retraining even if a cached model or parameters exist
             
         Returns:
             None
@@ -57,59 +85,112 @@ class SARIMAPredictor(BaseTimeSeriesModel):
         
         # Extract time series
         series = data['Weekly_Close'] if isinstance(data, pd.DataFrame) else data
+        values = np.asarray(series, dtype=float)
+        self.series = values
+        self._apply_to_series = False
         
-        # If ticker is provided, try to use cached parameters
+        # If ticker is provided, try to use the cached fitted model or parameters
         if ticker and not force_retrain:
-            params_filepath = self._get_params_filepath(ticker)
+            cached = self.store.get(ticker) if self._state_ticker != ticker else None
             
-            if os.path.exists(params_filepath):
+            if self._state_ticker == ticker or (cached is not None and cached['state'] is not None):
+                if self._state_ticker != ticker:
+                    self.logger.info(f"Loading cached SARIMA model for {ticker}")
+                    self.model = cached['state']
+                    self.order = cached['order']
+                    self.seasonal_order = cached['seasonal_order']
+                    self._fitted_n_obs = cached['n_obs']
+                    self._state_ticker = ticker
+                
+                # Apply the fitted coefficients to a series no longer than the one
+                # they were estimated on; once new observations have arrived,
+                # re-estimate them at the known orders
+                if self._fitted_n_obs is not None and len(values) <= self._fitted_n_obs:
+                    self._apply_to_series = True
+                    return
+                
+                self.logger.info(f"Re-estimating SARIMA coefficients for {ticker} on {len(values)} observations")
+                self._fit_orders(values)
+                self._save_state(ticker)
+                return
+            
+            if cached is not None:
                 self.logger.info(f"Loading cached SARIMA parameters for {ticker}")
-                with open(params_filepath, 'r') as f:
-                    params = json.load(f)
-                    
-                self.order = tuple(params['order'])
-                self.seasonal_order = tuple(params['seasonal_order'])
+                self.order = cached['order']
+                self.seasonal_order = cached['seasonal_order']
                 
                 self.logger.info(f"Using cached parameters: {self.order}, {self.seasonal_order}")
-                self.model = pm.ARIMA(order=self.order, seasonal_order=self.seasonal_order).fit(series)
+                self._fit_orders(values)
+                self._save_state(ticker)
                 return
         
-        # No cache or forced retraining - run auto_arima
-        self.logger.info("Running auto_arima parameter search...")
-        self.model = pm.auto_arima(
-            series,
+        # No cache or forced retraining - run the compiled AutoARIMA search
+        self.logger.info("Running AutoARIMA parameter search...")
+        self._state_ticker = None
+        self.model = AutoARIMA(
             start_p=1, start_q=1,
-            test='adf',
             max_p=3, max_q=3,
-            m=52,  # Weekly seasonality
+            season_length=SEASON_LENGTH,
             d=None,  # Let the model determine differencing
             seasonal=True,
             start_P=0,
             D=1,  # Seasonal differencing
             trace=self.logger.level == logging.DEBUG,
-            error_action='ignore',
-            suppress_warnings=True,
             stepwise=True
-        )
-        
-        self.order = self.model.order
-        self.seasonal_order = self.model.seasonal_order
+        ).fit(values)
+        self._fitted_n_obs = len(values)
+        self._set_orders_from_model()
         
-        # Save parameters if ticker is provided
+        # Save parameters and the fitted model if ticker is provided
         if ticker:
-            params_filepath = self._get_params_filepath(ticker)
             self.logger.info(f"Saving optimal parameters for {ticker} to cache")
-            
-            params_to_save = {
-                'order': self.order,
-                'seasonal_order': self.seasonal_order
-            }
-            
-            with open(params_filepath, 'w') as f:
-                json.dump(params_to_save, f)
+            self._save_state(ticker)
                 
         self.logger.info(f"Model trained with parameters: {self.order}, {self.seasonal_order}")
     
+    def refit(self, data, ticker=None):
+        """Re-estimate the coefficients on new data, keeping the current orders.
+        
+        Much cheaper than a forced retrain since the AutoARIMA order search is
+        skipped. Falls back to a full training if no orders are known yet.
+        
+        Args:
+            data: DataFrame with Date and Weekly_Close columns or a Series
+            ticker: Company ticker symbol for caching the refitted model
+            
+        Returns:
+            None
+        """
+        if self.order is None or self.seasonal_order is None:
+            self.train(data, ticker=ticker, force_retrain=True)
+            return
+            
+        data = self._validate_data(data) if isinstance(data, pd.DataFrame) else data
+        series = data['Weekly_Close'] if isinstance(data, pd.DataFrame) else data
+        values = np.asarray(series, dtype=float)
+        self.series = values
+        self._apply_to_series = False
+        
+        self.logger.info(f"Refitting SARIMA with parameters: {self.order}, {self.seasonal_order}")
+        self._fit_orders(values)
+        if ticker:
+            self._save_state(ticker)
+    
+    def update(self, new_value):
+        """Extend the series with a new observation without re-estimating the model.
+        
+        Args:
+            new_value: The newly observed Weekly_Close value
+            
+        Raises:
+            ValueError: If model hasn't been trained
+        """
+        if self.model is None:
+            raise ValueError("Model must be trained before it can be updated")
+            
+        self.series = np.append(self.series, float(new_value))
+        self._apply_to_series = True
+    
     def predict(self, steps=1, **kwargs):
         """Generate predictions using the trained SARIMA model.
         
@@ -117,7 +198,7 @@ class SARIMAPredictor(BaseTimeSeriesModel):
             steps: Number of steps to forecast
             
         Returns:
-            Forecasted values
+            Forecasted value as a float when steps is 1, otherwise a numpy array
             
         Raises:
             ValueError: If model hasn't been trained
@@ -125,5 +206,10 @@ class SARIMAPredictor(BaseTimeSeriesModel):
         if self.model is None:
             raise ValueError("Model must be trained before making predictions")
             
-        predictions = self.model.predict(n_periods=steps)
-        return predictions.iloc[0] if steps == 1 else predictions
+        # statsforecast returns plain numpy arrays, so the one-step case only
+        # indexes the array; no pandas objects are built on either path
+        if self._apply_to_series:
+            predictions = self.model.forward(self.series, h=steps)['mean']
+        else:
+            predictions = self.model.predict(h=steps)['mean']
+        return float(predictions[0]) if steps == 1 else predictions
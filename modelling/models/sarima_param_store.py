@@ -0,0 +1,125 @@
+"""File-backed cache of SARIMA orders and fitted models."""
+import json
+import os
+import tempfile
+
+import joblib
+
+
+class SarimaParamStore:
+    """Cache of SARIMA orders and fitted models, one pair of files per ticker.
+
+    Orders live in ``{ticker}_params.json`` (the format earlier versions
+    wrote, so existing caches keep working) and fitted models in
+    ``{ticker}_state.pkl``. Every write goes to a temporary file in the same
+    directory and is then renamed over the target, so concurrent workers
+    never leave a half-written file behind. This does not rely on file
+    locking, which is unreliable on the SMB share the cache lives on.
+    Entries are kept in memory after the first read or write.
+    """
+
+    def __init__(self, cache_dir):
+        """Initialize the store, creating the cache directory if needed.
+
+        Args:
+            cache_dir: Directory holding the per-ticker cache files
+        """
+        self.cache_dir = str(cache_dir)
+        self._cache = {}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _params_path(self, ticker):
+        """Path of the JSON file holding a ticker's orders."""
+        return os.path.join(self.cache_dir, f"{ticker}_params.json")
+
+    def _state_path(self, ticker):
+        """Path of the file holding a ticker's fitted model."""
+        return os.path.join(self.cache_dir, f"{ticker}_state.pkl")
+
+    def _atomic_write(self, path, write):
+        """Write a file via a temporary file that is renamed over the target.
+
+        Args:
+            path: Destination path
+            write: Callable that writes the contents to the path it is given
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, ticker):
+        """Get the cached entry for a ticker.
+
+        Args:
+            ticker: Company ticker symbol
+
+        Returns:
+            Dictionary with order, seasonal_order, state (the fitted model,
+            or None if only the orders are known) and n_obs (the length of the
+            series the model was fitted on, or None if unknown), or None if
+            nothing is cached
+        """
+        if ticker in self._cache:
+            return self._cache[ticker]
+
+        params_path = self._params_path(ticker)
+        if not os.path.exists(params_path):
+            return None
+        with open(params_path, 'r') as f:
+            params = json.load(f)
+
+        # The fitted model is stored together with the length of the series it
+        # was fitted on; state files from earlier versions hold the bare model
+        # and are ignored, since it is unknown what they were fitted on
+        state, n_obs = None, None
+        state_path = self._state_path(ticker)
+        if os.path.exists(state_path):
+            saved = joblib.load(state_path)
+            if isinstance(saved, dict) and 'n_obs' in saved:
+                state, n_obs = saved['model'], saved['n_obs']
+
+        entry = {
+            'order': tuple(params['order']),
+            'seasonal_order': tuple(params['seasonal_order']),
+            'state': state,
+            'n_obs': n_obs
+        }
+        self._cache[ticker] = entry
+        return entry
+
+    def put(self, ticker, order, seasonal_order, state=None, n_obs=None):
+        """Store the orders and optionally the fitted model for a ticker.
+
+        Args:
+            ticker: Company ticker symbol
+            order: (p, d, q) order
+            seasonal_order: (P, D, Q, m) seasonal order
+            state: Fitted model to cache, if any
+            n_obs: Length of the series the model was fitted on, if known
+        """
+        params = {
+            'order': list(order),
+            'seasonal_order': list(seasonal_order)
+        }
+
+        def write_params(path):
+            with open(path, 'w') as f:
+                json.dump(params, f)
+
+        if state is not None:
+            saved = {'model': state, 'n_obs': n_obs}
+            self._atomic_write(self._state_path(ticker), lambda path: joblib.dump(saved, path))
+        self._atomic_write(self._params_path(ticker), write_params)
+        self._cache[ticker] = {
+            'order': tuple(order),
+            'seasonal_order': tuple(seasonal_order),
+            'state': state,
+            'n_obs': n_obs if state is not None else None
+        }
@@ -2,7 +2,6 @@
 import logging
 import os
 import numpy as np
-import pandas as pd
 import torch
 from transformers import AutoModelForCausalLM
 from .base_model import BaseTimeSeriesModel
@@ -11,41 +10,53 @@ from ..config.constants import TIMEMOE_CACHE_DIR
 # Disable oneDNN optimizations which can cause issues with TimeMOE
 os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
 
+# Number of past data points each forecast is conditioned on
+DEFAULT_SEQ_LEN = 10
+
 
 class TimeMOEPredictor(BaseTimeSeriesModel):
     """TimeMOE model for time series forecasting."""
     
-    def __init__(self, cache_dir=None, log_level=logging.INFO):
+    def __init__(self, cache_dir=None, log_level=logging.INFO, dtype=None):
         """Initialize the TimeMOE model.
         
         Args:
             cache_dir: Directory to cache the model
             log_level: Logging level
+            dtype: Torch dtype for the weights and inference; by default half
+                precision on GPU and float32 on CPU
         """
         super().__init__(log_level)
         self.model = None
         self.cache_dir = cache_dir or TIMEMOE_CACHE_DIR
-        self.data = None
         self.training_data = None
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.logger.info(f"Using device: {str(self.device)}")
+        # Half precision halves the weight and activation traffic on GPU;
+        # CPUs keep float32, where half precision matmuls are rarely faster
+        if dtype is not None:
+            self.dtype = dtype
+        elif self.device.type == "cuda":
+            self.dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        else:
+            self.dtype = torch.float32
+        self.logger.info(f"Using device: {str(self.device)} ({self.dtype})")
         if self.cache_dir:
             self.logger.info(f"Using cache directory: {self.cache_dir}")
         # Don't initialize the model here, it will be lazy-loaded in train()
         # This avoids loading the large model until it's actually needed
     
     def _normalize_data(self, data):
-        """Normalize the input data.
+        """Normalize each row of the input data in place.
         
         Args:
-            data: Data to normalize
+            data: Tensor of shape (batch, seq_len) to normalize; it is overwritten
             
         Returns:
-            Tuple of (normalized_data, mean, std)
+            Tuple of (normalized_data, mean, std), with mean and std of shape (batch, 1)
         """
-        mean = data.mean()
-        std = data.std()
-        return (data - mean) / std, mean, std
+        # One fused pass for both statistics
+        std, mean = torch.std_mean(data, dim=-1, keepdim=True)
+        return data.sub_(mean).div_(std), mean, std
     
     def train(self, data, **kwargs):
         """Prepare the predictor with the latest training data.
@@ -62,18 +73,21 @@ class TimeMOEPredictor(BaseTimeSeriesModel):
         """
         data = self._validate_data(data)
         
-        # Store clean data for prediction
-        self.data = data.copy()
-        
-        # Store the (sorted) series of prices for prediction
-        if isinstance(data, pd.DataFrame):
-            self.training_data = data.sort_values(by="Date")["Weekly_Close"].values
-        else:
-            self.training_data = data
+        # Only the price series is needed for prediction; _validate_data has
+        # already sorted the frame by Date
+        self.training_data = data["Weekly_Close"].to_numpy()
         
         self.logger.info(f"TimeMOE prepared with {len(data)} data points")
         
         # Lazily load the model the first time `train` is called
+        self._load_model()
+    
+    def _load_model(self):
+        """Load the TimeMOE model unless it is already loaded.
+        
+        Raises:
+            ImportError: If the 'accelerate' package is missing
+        """
         if self.model is None:
             self.logger.info("Loading TimeMOE model (this can take a while)...")
             try:
@@ -82,10 +96,12 @@ class TimeMOEPredictor(BaseTimeSeriesModel):
                     cache_dir=self.cache_dir,
                     trust_remote_code=True,
                     revision="main",
+                    torch_dtype=self.dtype,
                 )
                 self.model.to(self.device)
                 self.model.eval()  # inference mode – no gradients
                 self.logger.info("TimeMOE model loaded successfully")
+                self._compile_model()
             except Exception as e:
                 if "accelerate" in str(e):
                     # Give a more actionable error message if the dependency is missing
@@ -97,7 +113,89 @@ class TimeMOEPredictor(BaseTimeSeriesModel):
                 self.logger.warning(f"Failed to initialize TimeMOE model: {e}")
                 self.model = None
     
-    def predict(self, steps=1, seq_len=10, **kwargs):
+    def _compile_model(self):
+        """Compile the model's forward pass on GPU, keeping the eager model if compilation fails.
+        
+        On CPU the model runs eagerly: a file only needs one or two forward
+        passes, which the compilation time would far outweigh.
+        """
+        if not hasattr(torch, "compile") or self.device.type != "cuda":
+            return
+            
+        # Each distinct batch shape compiles its own graph
+        torch._dynamo.config.cache_size_limit = 8
+        eager_model = self.model
+        try:
+            self.model = torch.compile(eager_model, mode="reduce-overhead", fullgraph=False)
+            # Pay the compilation cost up front with the single-forecast shape, under
+            # the same inference mode as the real calls so the graph is reused
+            dummy = torch.zeros(1, DEFAULT_SEQ_LEN, device=self.device, dtype=self.dtype)
+            with torch.inference_mode(), self._autocast():
+                self.model(dummy)
+            self.logger.info("TimeMOE model compiled")
+        except Exception as e:
+            self.logger.warning(f"Failed to compile TimeMOE model, running it eagerly: {e}")
+            self.model = eager_model
+    
+    def _autocast(self):
+        """Get the autocast context for the model's precision.
+        
+        Returns:
+            Autocast context manager, disabled when running in float32
+        """
+        return torch.autocast(device_type=self.device.type, dtype=self.dtype,
+                              enabled=self.dtype != torch.float32)
+    
+    def predict_batch(self, series, start, seq_len=DEFAULT_SEQ_LEN):
+        """Predict the next value after every prefix of a series in one forward pass.
+        
+        Equivalent to training on `series[:t]` and calling `predict` for each
+        `t` from `start` to `len(series) - 1`, since TimeMOE only conditions
+        on the last `seq_len` points.
+        
+        Args:
+            series: 1-D array of Weekly_Close values sorted by date
+            start: Length of the first prefix to predict from
+            seq_len: Number of past data points to use for each prediction
+            
+        Returns:
+            Array with one forecast per prefix
+            
+        Raises:
+            ValueError: If the first prefix is shorter than seq_len
+        """
+        if start < seq_len:
+            raise ValueError(f"Need at least {seq_len} points before the first prediction, got {start}")
+            
+        self._load_model()
+        if self.model is None:
+            raise ValueError("TimeMOE model failed to initialize")
+        
+        # Row k holds the seq_len points preceding position start + k
+        series = np.asarray(series, dtype=np.float32)
+        windows = np.lib.stride_tricks.sliding_window_view(series, seq_len)[start - seq_len:len(series) - seq_len]
+        
+        self.logger.info(f"Generating {len(windows)} TimeMOE forecasts in one batch...")
+        # Copy the windows: they are a read-only view of the caller's series,
+        # and _normalize_data overwrites its input
+        x = torch.from_numpy(windows.copy()).to(self.device)
+        
+        # Normalize each window on its own statistics
+        normed, mean, std = self._normalize_data(x)
+        
+        with torch.inference_mode(), self._autocast():
+            outputs = self.model(normed.to(self.dtype))
+            if isinstance(outputs, tuple):
+                logits = outputs[0]
+            else:
+                logits = outputs.logits if hasattr(outputs, 'logits') else outputs
+            
+            # Last position of each window, denormalized
+            predictions = logits[:, -1].reshape(len(windows), -1)[:, 0].float() * std.squeeze(1) + mean.squeeze(1)
+        
+        return predictions.cpu().numpy()
+    
+    def predict(self, steps=1, seq_len=DEFAULT_SEQ_LEN, **kwargs):
         """Generate predictions using the TimeMOE model.
         
         Args:
@@ -105,7 +203,7 @@ class TimeMOEPredictor(BaseTimeSeriesModel):
             seq_len: Number of past data points to use for prediction
             
         Returns:
-            Forecasted value
+            Forecasted value as a 0-d tensor on the model's device
             
         Raises:
             ValueError: If model hasn't been loaded or data not prepared
@@ -113,41 +211,38 @@ class TimeMOEPredictor(BaseTimeSeriesModel):
         if self.model is None:
             raise ValueError("TimeMOE model failed to initialize")
             
-        if self.data is None and self.training_data is None:
+        if self.training_data is None:
             raise ValueError("Data must be prepared before making predictions")
             
         self.logger.info("Generating TimeMOE forecast...")
         
         try:
-            # Use training data if available, otherwise use data
-            data = self.training_data if self.training_data is not None else self.data['Weekly_Close'].values
+            data = self.training_data
             
             # Use the last seq_len points from the available data
             data = data[-seq_len:]
             
-            # Convert to tensor and reshape
-            seq = torch.FloatTensor(data).view(1, -1)
-            seq = seq.to(self.device)
+            # Copy into a new tensor, since _normalize_data overwrites its input
+            seq = torch.tensor(data, dtype=torch.float32, device=self.device).view(1, -1)
             
             # Normalize data
             normed_seq, mean, std = self._normalize_data(seq)
             
             self.logger.info("Starting TimeMOE prediction...")
             # Generate prediction
-            with torch.no_grad():
+            with torch.inference_mode(), self._autocast():
                 # Forward pass through the model
-                outputs = self.model(normed_seq)
+                outputs = self.model(normed_seq.to(self.dtype))
                 # Get the last prediction
                 if isinstance(outputs, tuple):
                     logits = outputs[0]
                 else:
                     logits = outputs.logits if hasattr(outputs, 'logits') else outputs
                 
-                prediction = logits[0, -1].item()
-                # Denormalize the prediction
-                result = prediction * std + mean
-                
-                return result
+                # Denormalize on the device; the caller's single .item() is the
+                # only device-to-host transfer
+                prediction = logits[0, -1].reshape(-1)[0].float()
+                return prediction * std.squeeze() + mean.squeeze()
                 
         except Exception as e:
             self.logger.error(f"TimeMOE prediction error: {e}")
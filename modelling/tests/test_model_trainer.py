@@ -0,0 +1,71 @@
+"""
+Unit tests for the model trainer module.
+"""
+
+import os
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+# Imported up front so they stay loaded when the stubbed modules are removed again
+import numpy as np  # noqa: F401
+import pandas as pd  # noqa: F401
+
+# Add the project root to the path so the modelling package can be imported
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+
+class FakePredictor:
+    """Stand-in for a forecasting model that records its constructor arguments."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+def _fake_module(name, **attrs):
+    """Build a module object with the given attributes."""
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+class TestModelTrainer(unittest.TestCase):
+    """Test cases for the ModelTrainer class."""
+
+    def setUp(self):
+        """Import the trainer with the heavy model implementations stubbed out."""
+        stubs = {
+            'tqdm': _fake_module('tqdm', tqdm=lambda iterable, **kwargs: iterable),
+            'modelling.models.sarima_model': _fake_module(
+                'modelling.models.sarima_model', SARIMAPredictor=FakePredictor),
+            'modelling.models.autots_model': _fake_module(
+                'modelling.models.autots_model', AutoTSPredictor=FakePredictor),
+            'modelling.models.timemoe_model': _fake_module(
+                'modelling.models.timemoe_model', TimeMOEPredictor=FakePredictor),
+        }
+        # patch.dict restores sys.modules afterwards, dropping the modules imported here
+        modules_patch = patch.dict(sys.modules, stubs)
+        modules_patch.start()
+        self.addCleanup(modules_patch.stop)
+
+        from modelling.utils.model_trainer import ModelTrainer
+        self.ModelTrainer = ModelTrainer
+
+    def test_initialize_models(self):
+        """Test that the trainer builds all three models."""
+        trainer = self.ModelTrainer(cache_dir='test_cache', dtype='float32')
+
+        self.assertEqual(sorted(trainer.models), ['AutoTS', 'SARIMA', 'TimeMOE'])
+        self.assertEqual(trainer.models['TimeMOE'].kwargs['cache_dir'], 'test_cache')
+        self.assertEqual(trainer.models['TimeMOE'].kwargs['dtype'], 'float32')
+
+    def test_missing_config_uses_defaults(self):
+        """Test that a missing config file falls back to the default configuration."""
+        trainer = self.ModelTrainer(config_path='/nonexistent/model_config.json')
+
+        self.assertEqual(trainer.config, {"test_size": 0.2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,9 @@ import logging
 import sys
 from datetime import datetime
 
+import pandas as pd
+from joblib import Parallel, delayed, parallel_backend
+
 # Add the parent directory to sys.path to allow local imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -31,10 +34,18 @@ def parse_arguments():
     parser.add_argument(
         '--ticker',
         type=str,
-        help='Company ticker symbol (e.g., AAPL)',
+        nargs='+',
+        help='Company ticker symbol(s) (e.g., AAPL MSFT)',
         required=True
     )
     
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of tickers to train in parallel (-1 uses all cores)'
+    )
+    
     parser.add_argument(
         '--test-run',
         action='store_true',
@@ -99,18 +110,21 @@ def configure_logging(log_level_name):
     return log_level
 
 
-def main():
-    """Main function to train and evaluate models."""
-    # Parse arguments
-    args = parse_arguments()
+def run_one(ticker, args):
+    """Train and evaluate models for a single company and save its predictions.
     
-    # Configure logging
+    Args:
+        ticker: Company ticker symbol
+        args: Parsed command line arguments
+        
+    Returns:
+        Path to the saved predictions file, or None if no data was found or
+        training failed; errors are logged so the other tickers keep running
+    """
+    # Worker processes don't inherit the parent's logging configuration
     log_level = configure_logging(args.log_level)
     logger = logging.getLogger(__name__)
     
-    # Create necessary directories
-    os.makedirs(args.output_dir, exist_ok=True)
-    
     # Initialize components
     trainer = ModelTrainer(
         config_path=args.config_path,
@@ -122,12 +136,12 @@ def main():
     
     try:
         # Load company data
-        logger.info(f"Loading data for {args.ticker}...")
-        data, start_date, end_date = processor.load_company_data(args.ticker)
+        logger.info(f"Loading data for {ticker}...")
+        data, start_date, end_date = processor.load_company_data(ticker)
         
         if data is None:
-            logger.error(f"No data found for {args.ticker}")
-            return
+            logger.error(f"No data found for {ticker}")
+            return None
         
         # Use a smaller subset for test runs
         if args.test_run:
@@ -141,30 +155,57 @@ def main():
         
         # Train and evaluate models
         logger.info("Training and evaluating models (rolling window)...")
-        results = trainer.train(train_data, test_data, args.ticker)
+        results = trainer.train(train_data, test_data, ticker)
         
         # Generate next-week forecast
         logger.info("Generating forecast for next week...")
-        next_week_forecast = trainer.forecast_next_week(data, args.ticker)
+        next_week_forecast = trainer.forecast_next_week(data, ticker)
         
         # Append next-week predictions to results
-        results = results.append(next_week_forecast, ignore_index=True)
+        results = pd.concat([results, pd.DataFrame([next_week_forecast])], ignore_index=True)
         
         # Save results
         output_path = os.path.join(args.output_dir, "model_predictions")
         final_path = save_predictions(
             results,
             output_path,
-            args.ticker,
+            ticker,
             start_date,
             end_date
         )
         
         logger.info(f"Process completed successfully! Results saved to {final_path}")
+        return final_path
         
     except Exception as e:
-        logger.error(f"Error in main process: {str(e)}", exc_info=True)
-        raise
+        logger.error(f"Error in main process for {ticker}: {str(e)}", exc_info=True)
+        return None
+
+
+def main():
+    """Main function to train and evaluate models."""
+    # Parse arguments
+    args = parse_arguments()
+    
+    # Configure logging
+    configure_logging(args.log_level)
+    
+    # Create necessary directories
+    os.makedirs(args.output_dir, exist_ok=True)
+    
+    # Tickers are independent, so each one trains in its own worker process;
+    # with a single job they run one after another in this process. Workers
+    # get single-threaded BLAS/OpenMP so concurrent SARIMA fits don't
+    # oversubscribe the cores
+    with parallel_backend('loky', inner_max_num_threads=1):
+        results = Parallel(n_jobs=args.jobs, batch_size=1)(
+            delayed(run_one)(ticker, args) for ticker in args.ticker
+        )
+    
+    failed = [ticker for ticker, path in zip(args.ticker, results) if path is None]
+    if failed:
+        logging.getLogger(__name__).error(f"Training failed for: {', '.join(failed)}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ import argparse
 import logging
 from datetime import datetime, timedelta
 import pandas as pd
+from joblib import Parallel, delayed, parallel_backend
 from pathlib import Path
 import sys
 import re
@@ -20,9 +21,13 @@ from modelling.config.constants import (
     SCRAPED_DATA_DIR,
     MODEL_CONFIG_PATH,
     DEFAULT_LOG_LEVEL,
-    DATE_FORMAT
+    DATE_FORMAT,
+    CSV_WRITE_BUFFER_SIZE
 )
 
+# Prediction file names, capturing the ticker
+PRED_FILENAME_RE = re.compile(r'model_predictions_\d{8}_\d{6}_([A-Z]+)_\d{8}_\d{8}\.csv')
+
 
 def parse_arguments():
     """Parse command line arguments.
@@ -67,6 +72,13 @@ def parse_arguments():
         default=None
     )
     
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of prediction files to update in parallel (-1 uses all cores)'
+    )
+    
     parser.add_argument(
         '--log-level',
         type=str,
@@ -111,8 +123,7 @@ def derive_ticker(pred_file):
     """
     # Extract from model_predictions_YYYYMMDD_HHMMSS_TICKER_YYYYMMDD_YYYYMMDD.csv
     filename = Path(pred_file).name
-    pattern = r'model_predictions_\d{8}_\d{6}_([A-Z]+)_\d{8}_\d{8}\.csv'
-    match = re.match(pattern, filename)
+    match = PRED_FILENAME_RE.match(filename)
     
     if match:
         return match.group(1)
@@ -129,18 +140,40 @@ def load_existing_predictions(pred_path):
     Returns:
         DataFrame with predictions
     """
-    df = pd.read_csv(pred_path)
-    df['Date'] = pd.to_datetime(df['Date'])
-    return df
+    return pd.read_csv(pred_path, parse_dates=['Date'])
+
 
+# Trainer shared by all files updated in this process
+_trainer = None
 
-def update_predictions_file(pred_file, args, log_level):
+
+def _get_shared_trainer(args, log_level):
+    """Get this process's shared trainer, creating it on first use.
+    
+    One trainer per process means the TimeMOE weights are loaded only once.
+    
+    Args:
+        args: Command line arguments
+        log_level: Logging level
+        
+    Returns:
+        ModelTrainer instance
+    """
+    global _trainer
+    if _trainer is None:
+        _trainer = ModelTrainer(cache_dir=args.cache_dir, log_level=log_level)
+    return _trainer
+
+
+def update_predictions_file(pred_file, args, log_level, trainer=None):
     """Update a single predictions file with new data and forecasts.
     
     Args:
         pred_file: Path to predictions file
         args: Command line arguments
         log_level: Logging level
+        trainer: ModelTrainer to use; by default the trainer shared by all files
+            updated in this process, created on first use
         
     Returns:
         Path to updated predictions file, or None if update wasn't needed
@@ -168,6 +201,13 @@ def update_predictions_file(pred_file, args, log_level):
     logger.info(f"Extracted ticker symbol: {ticker}")
     processor = DataProcessor(args.scraped_folder)
     
+    # The scraper names each data folder after the last date it holds, so an
+    # up-to-date file is recognised without reading the company data
+    data_end_date = processor.get_data_end_date(ticker)
+    if data_end_date is not None and data_end_date <= start_date:
+        logger.info(f"No new data for {ticker} after {start_date.date()}")
+        return None
+    
     try:
         data, _, end_date = processor.load_company_data(ticker)
     except ValueError as e:
@@ -181,30 +221,40 @@ def update_predictions_file(pred_file, args, log_level):
             logger.error(f"Scraped data folder does not exist: {args.scraped_folder}")
         raise
     
-    # Identify new rows following the last actual observation
-    new_mask = data['Date'] > start_date
-    if not new_mask.any():
+    # Split data for training and testing at the last actual observation; the
+    # data is sorted by Date, so the split point is found by binary search and
+    # both parts are plain slices
+    split_idx = data['Date'].searchsorted(start_date, side='right')
+    if split_idx == len(data):
         logger.info(f"No new data for {ticker} after {start_date.date()}")
         return None
     
-    # Split data for training and testing
-    train_data = data[data['Date'] <= start_date].copy()
-    test_data = data[new_mask].copy()
+    train_data = data.iloc[:split_idx]
+    test_data = data.iloc[split_idx:]
     
-    # Initialize trainer and generate new predictions
-    trainer = ModelTrainer(cache_dir=args.cache_dir, log_level=log_level)
+    # Generate new predictions; the trainer is only built once a file
+    # actually has new data
+    if trainer is None:
+        trainer = _get_shared_trainer(args, log_level)
     new_results = trainer.train(train_data, test_data, ticker)
     
     # Generate next-week forecast using all available data
-    clean_data = data.dropna(subset=['Weekly_Close'])
+    clean_data = data.dropna(subset=['Weekly_Close']) if data['Weekly_Close'].hasnans else data
     next_week_row = trainer.forecast_next_week(clean_data, ticker)
     
-    # Combine existing valid data with new predictions and forecast
+    # Next week's row in the same schema and dtypes as the new predictions, so
+    # its missing actual doesn't turn the combined column into object dtype
+    next_week = pd.DataFrame([next_week_row], columns=new_results.columns).astype(
+        new_results.dtypes.to_dict()
+    )
+    
+    # Combine existing valid data with new predictions and forecast in one
+    # concatenation, without copying the inputs first
     updated_pred = pd.concat([
         old_pred.iloc[: cut_idx + 1],  # Keep existing valid data
         new_results,                   # Add new predictions
-        pd.DataFrame([next_week_row])  # Add next week forecast
-    ], ignore_index=True)
+        next_week                      # Add next week forecast
+    ], ignore_index=True, copy=False)
     
     # Save updated predictions with a new filename
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -214,7 +264,8 @@ def update_predictions_file(pred_file, args, log_level):
     new_filename = f"model_predictions_{timestamp}_{ticker}_{start_str}_{end_str}.csv"
     new_path = os.path.join(os.path.dirname(pred_file), new_filename)
     
-    updated_pred.to_csv(new_path, index=False)
+    with open(new_path, 'w', buffering=CSV_WRITE_BUFFER_SIZE, newline='') as f:
+        updated_pred.to_csv(f, index=False)
     logger.info(f"Saved updated predictions to {new_path}")
     
     # Clean up old predictions file
@@ -227,6 +278,29 @@ def update_predictions_file(pred_file, args, log_level):
     return new_path
 
 
+def _update_file_safely(pred_file, args, log_level):
+    """Update a predictions file, logging any error instead of raising it.
+    
+    Args:
+        pred_file: Path to predictions file
+        args: Command line arguments
+        log_level: Logging level
+        
+    Returns:
+        Path to updated predictions file, or None if it wasn't updated
+    """
+    # Worker processes don't inherit the parent's logging configuration
+    configure_logging(args.log_level)
+    logger = logging.getLogger(__name__)
+    
+    try:
+        return update_predictions_file(pred_file, args, log_level)
+    except Exception as e:
+        logger.error(f"Error updating {pred_file}: {e}", exc_info=True)
+        # Continue with other files
+        return None
+
+
 def main(args=None):
     """Main function to update prediction files."""
     # Parse arguments
@@ -255,13 +329,30 @@ def main(args=None):
         logger.error(f"Prediction directory {pred_dir} does not exist")
         return
     
-    # Process each prediction file
-    for csv_path in sorted(pred_dir.glob('model_predictions_*.csv')):
-        try:
-            update_predictions_file(str(csv_path), args, log_level)
-        except Exception as e:
-            logger.error(f"Error updating {csv_path}: {e}", exc_info=True)
-            # Continue with other files
+    pred_files = [str(csv_path) for csv_path in sorted(pred_dir.glob('model_predictions_*.csv'))]
+    
+    # Resolve joblib's negative counts and cap at one worker per file and core,
+    # as every extra worker only adds another set of loaded models
+    jobs = getattr(args, 'jobs', 1)
+    n_cpus = os.cpu_count() or 1
+    if jobs < 0:
+        jobs = n_cpus + 1 + jobs
+    jobs = max(1, min(jobs, len(pred_files), n_cpus))
+    if jobs != 1:
+        # Only needed to count GPUs, so a sequential run does not pay for the import
+        import torch
+        if torch.cuda.device_count() == 1:
+            # Every worker would load its own TimeMOE copy onto the same device
+            logger.warning("A single GPU is shared by all workers; updating files one at a time")
+            jobs = 1
+    
+    # Files are independent, so each one is updated in a worker process; with
+    # a single job they run one after another in this process. Workers get
+    # single-threaded BLAS/OpenMP so concurrent fits don't oversubscribe the cores
+    with parallel_backend('loky', inner_max_num_threads=1):
+        Parallel(n_jobs=jobs, batch_size=1)(
+            delayed(_update_file_safely)(pred_file, args, log_level) for pred_file in pred_files
+        )
 
 
 if __name__ == '__main__':
@@ -3,12 +3,43 @@ import os
 import pandas as pd
 from datetime import datetime
 import logging
-from pathlib import Path
+from functools import lru_cache
+from .file_utils import find_company_folder
 from ..config.constants import SCRAPED_DATA_DIR, DATE_FORMAT
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=128)
+def _read_company_csv(file_path, mtime_ns, ticker):
+    """Read and parse a company data file.
+    
+    Args:
+        file_path: Path to the company's data CSV
+        mtime_ns: Modification time of the file, so a changed file is re-read
+        ticker: Company ticker symbol
+        
+    Returns:
+        DataFrame with Date, Weekly_Close and ticker columns, sorted by Date
+        
+    Raises:
+        ValueError: If the file is missing required columns
+    """
+    # Only read the required columns, parsing dates while reading
+    required_cols = ['Date', 'Weekly_Close']
+    df = pd.read_csv(file_path, usecols=lambda col: col in required_cols,
+                     parse_dates=['Date'])
+    
+    # Ensure required columns exist
+    if not all(col in df.columns for col in required_cols):
+        raise ValueError(f"File {os.path.basename(file_path)} missing required columns {required_cols}")
+    
+    # Parsed and sorted once here, so the models' validation can skip it
+    df = df.sort_values('Date').reset_index(drop=True)
+    df['ticker'] = ticker
+    return df
+
+
 class DataProcessor:
     """Class for processing time series data for forecasting models."""
     
@@ -19,6 +50,7 @@ class DataProcessor:
             scraped_folder: Path to folder containing scraped data
         """
         self.scraped_folder = scraped_folder or SCRAPED_DATA_DIR
+        self._company_folders = {}
         
     def _extract_dates_from_folder(self, folder_name):
         """Extract start and end dates from folder name.
@@ -49,15 +81,26 @@ class DataProcessor:
         Returns:
             Path to the company data folder, or None if not found
         """
-        scraped_folder = Path(self.scraped_folder)
-        
-        # Look for folders with the ticker prefix
-        for item in scraped_folder.glob(f"{ticker}_*"):
-            if item.is_dir():
-                return item
-                
-        logger.warning(f"No data folder found for ticker {ticker}")
-        return None
+        if ticker not in self._company_folders:
+            folder = find_company_folder(self.scraped_folder, ticker)
+            if folder is None:
+                return None
+            self._company_folders[ticker] = folder
+        return self._company_folders[ticker]
+    
+    def get_data_end_date(self, ticker):
+        """Get the last date of a company's data from its folder name.
+        
+        Args:
+            ticker: Company ticker symbol
+            
+        Returns:
+            End date as a datetime, or None if the folder is missing or its name can't be parsed
+        """
+        folder_path = self.find_company_folder(ticker)
+        if folder_path is None:
+            return None
+        return self._extract_dates_from_folder(folder_path.name)[1]
     
     def load_company_data(self, ticker):
         """Load data for a specific company.
@@ -87,19 +130,12 @@ class DataProcessor:
             
             if file_path.exists():
                 try:
-                    df = pd.read_csv(file_path)
-                    
-                    # Ensure required columns exist
-                    required_cols = ['Date', 'Weekly_Close']
-                    if not all(col in df.columns for col in required_cols):
-                        raise ValueError(f"File {data_file} missing required columns {required_cols}")
-                    
-                    df = df[['Date', 'Weekly_Close']]
-                    df['Date'] = pd.to_datetime(df['Date'])
-                    df['ticker'] = ticker
+                    # Parsed files are cached until the file changes; callers get a
+                    # copy so they can't modify the cached frame
+                    mtime_ns = os.stat(file_path).st_mtime_ns
+                    data = _read_company_csv(str(file_path), mtime_ns, ticker).copy()
                     
                     logger.info(f"Loaded data from {file_path}")
-                    data = df
                     
                 except Exception as e:
                     logger.error(f"Error processing file {file_path}: {str(e)}")
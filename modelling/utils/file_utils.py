@@ -4,7 +4,7 @@ import pandas as pd
 import logging
 from datetime import datetime
 from pathlib import Path
-from ..config.constants import PREDICTIONS_DIR, DATE_FORMAT, TIMESTAMP_FORMAT
+from ..config.constants import PREDICTIONS_DIR, DATE_FORMAT, TIMESTAMP_FORMAT, CSV_WRITE_BUFFER_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -19,12 +19,16 @@ def find_company_folder(scraped_folder, ticker):
     Returns:
         Path to the company data folder, or None if not found
     """
-    scraped_folder = Path(scraped_folder)
-    
-    # Look for folders with the ticker prefix
-    for item in scraped_folder.glob(f"{ticker}_*"):
-        if item.is_dir():
-            return item
+    # Look for folders with the ticker prefix; scandir yields each entry's type
+    # without a separate stat, and symlinked folders are still followed
+    prefix = f"{ticker}_"
+    try:
+        with os.scandir(scraped_folder) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and entry.is_dir():
+                    return Path(entry.path)
+    except FileNotFoundError:
+        pass
             
     logger.warning(f"No data folder found for ticker {ticker}")
     return None
@@ -73,13 +77,13 @@ def save_predictions(predictions_df, base_path=None, ticker=None, start_date=Non
         # Otherwise use the default predictions directory
         output_path = os.path.join(PREDICTIONS_DIR, filename)
     
-    # Remove any existing error columns
-    error_cols = [col for col in predictions_df.columns if col.endswith('_error')]
-    if error_cols:
-        predictions_df = predictions_df.drop(columns=error_cols)
+    # Leave out any error columns; to_csv writes only the selected columns, so
+    # no filtered copy of the frame is made
+    keep_cols = [col for col in predictions_df.columns if not col.endswith('_error')]
     
     # Save the file
-    predictions_df.to_csv(output_path, index=False)
+    with open(output_path, 'w', buffering=CSV_WRITE_BUFFER_SIZE, newline='') as f:
+        predictions_df.to_csv(f, index=False, columns=keep_cols)
     logger.info(f"Predictions saved to {output_path}")
     
     return output_path
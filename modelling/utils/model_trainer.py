@@ -1,32 +1,92 @@
 """Model trainer module for time series forecasting."""
 import json
 import logging
+import os
 import pandas as pd
 from tqdm import tqdm
 import numpy as np
 from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 
 from ..models.sarima_model import SARIMAPredictor
 from ..models.autots_model import AutoTSPredictor
 from ..models.timemoe_model import TimeMOEPredictor
-from ..config.constants import MODEL_CONFIG_PATH, TIMEMOE_CACHE_DIR
+from ..config.constants import MODEL_CONFIG_PATH, TIMEMOE_CACHE_DIR, DEFAULT_SARIMA_REFIT_INTERVAL
+
+
+def _rolling_forecast(name, model, history, n_train, n_windows, ticker, refit_interval=0):
+    """Produce one-step-ahead forecasts for each rolling window of a single model.
+    
+    Runs in a worker process, so the model and data are received by value.
+    
+    Args:
+        name: Model name ('SARIMA' or 'AutoTS')
+        model: Model instance to train
+        history: DataFrame with the training data followed by the test data
+        n_train: Number of rows of the initial training data
+        n_windows: Number of rolling windows (test rows)
+        ticker: Company ticker symbol
+        refit_interval: Windows between SARIMA re-estimations (0 disables them)
+        
+    Returns:
+        Array of forecasts, one per window (NaN where the model failed)
+    """
+    logger = logging.getLogger(__name__)
+    predictions = np.full(n_windows, np.nan)
+    
+    for window in tqdm(range(n_windows), desc=f"Training {name} for {ticker}"):
+        current_train = history.iloc[:n_train + window]
+        try:
+            logger.info(f"Training {name} model (window {window + 1})")
+            
+            # Train model on current data
+            if name == 'SARIMA':
+                if window == 0 or model.model is None:
+                    model.train(current_train, ticker=ticker)
+                elif refit_interval and window % refit_interval == 0:
+                    model.refit(current_train, ticker=ticker)
+                else:
+                    model.update(current_train['Weekly_Close'].iloc[-1])
+            else:
+                model.train(current_train, ticker=ticker)
+            
+            # Make prediction
+            logger.info(f"Predicting with {name} model")
+            pred = model.predict()
+            
+            # Handle different return types
+            if hasattr(pred, 'item'):
+                pred = pred.item()
+            
+            predictions[window] = pred
+            
+        except Exception as e:
+            logger.error(f"Error in {name} model: {str(e)}")
+    
+    return predictions
 
 
 class ModelTrainer:
     """Class for training and evaluating time series forecasting models."""
     
-    def __init__(self, config_path=None, cache_dir=None, log_level=logging.INFO):
+    # Parsed configurations keyed by (path, modification time), shared by all trainers
+    _config_cache = {}
+    
+    def __init__(self, config_path=None, cache_dir=None, log_level=logging.INFO, dtype=None):
         """Initialize model trainer.
         
         Args:
             config_path: Path to model configuration JSON file
             cache_dir: Directory to cache TimeMOE model
             log_level: Logging level
+            dtype: Torch dtype for TimeMOE (default: half precision on GPU, float32 on CPU)
         """
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(log_level)
         self.config_path = config_path or MODEL_CONFIG_PATH
         self.cache_dir = cache_dir or TIMEMOE_CACHE_DIR
+        self.dtype = dtype
         
         # Load configuration
         self._load_config()
@@ -35,11 +95,14 @@ class ModelTrainer:
         self.models = self._initialize_models(log_level)
     
     def _load_config(self):
-        """Load model configuration from JSON file."""
+        """Load model configuration from JSON file, reusing it while the file is unchanged."""
         try:
-            with open(self.config_path, 'r') as f:
-                self.config = json.load(f)
-            self.logger.info(f"Loaded configuration from {self.config_path}")
+            key = (str(self.config_path), os.stat(self.config_path).st_mtime_ns)
+            if key not in ModelTrainer._config_cache:
+                with open(self.config_path, 'r') as f:
+                    ModelTrainer._config_cache[key] = json.load(f)
+                self.logger.info(f"Loaded configuration from {self.config_path}")
+            self.config = dict(ModelTrainer._config_cache[key])
         except Exception as e:
             self.logger.warning(f"Failed to load config from {self.config_path}: {e}")
             self.logger.warning("Using default configuration")
@@ -57,12 +120,18 @@ class ModelTrainer:
         return {
             'SARIMA': SARIMAPredictor(log_level=log_level),
             'AutoTS': AutoTSPredictor(log_level=log_level),
-            'TimeMOE': TimeMOEPredictor(cache_dir=self.cache_dir, log_level=log_level)
+            'TimeMOE': TimeMOEPredictor(cache_dir=self.cache_dir, log_level=log_level, dtype=self.dtype)
         }
     
     def train(self, train_data, test_data, ticker):
         """Train models and generate predictions using rolling window.
         
+        SARIMA and AutoTS run their rolling windows concurrently in worker
+        processes, while TimeMOE stays in the main process next to its
+        already loaded model. A single window, the usual incremental update,
+        runs entirely in this process since starting workers would cost more
+        than the work itself.
+        
         Args:
             train_data: Training data DataFrame
             test_data: Test data DataFrame
@@ -71,48 +140,54 @@ class ModelTrainer:
         Returns:
             DataFrame with predictions from all models
         """
-        results = []
-        current_train = train_data.copy()
+        history = pd.concat([train_data, test_data], ignore_index=True)
+        n_train, n_windows = len(train_data), len(test_data)
+        
+        # SARIMA coefficients are re-estimated every this many windows (0
+        # disables it), keeping the orders found by the search; in between,
+        # the latest observation is added to the fitted model
+        refit_interval = self.config.get('sarima_refit_interval', DEFAULT_SARIMA_REFIT_INTERVAL)
+        
+        pool_models = [name for name in ('SARIMA', 'AutoTS') if name in self.models]
+        rolling_args = (history, n_train, n_windows, ticker, refit_interval)
+        parallel = n_windows > 1 and len(pool_models) > 1
+        predictions = {}
         
-        for idx, row in tqdm(test_data.iterrows(), total=len(test_data), desc=f"Training models for {ticker}"):
-            predictions = {'Date': row['Date'], 'ticker': ticker}
+        with ProcessPoolExecutor(max_workers=len(pool_models)) if parallel else nullcontext() as pool:
+            futures = {
+                name: pool.submit(_rolling_forecast, name, self.models[name], *rolling_args)
+                for name in pool_models
+            } if parallel else {}
             
-            # Get predictions from each model
-            for name, model in self.models.items():
+            # TimeMOE only conditions on the latest observations, so the forecasts
+            # of all windows are computed up front in a single batch while the
+            # workers are busy
+            if 'TimeMOE' in self.models:
                 try:
-                    self.logger.info(f"Training {name} model (window {idx - train_data.index[0] + 1})")
-                    
-                    # Train model on current data
-                    if name == 'SARIMA':
-                        model.train(current_train, ticker=ticker)
+                    predictions['TimeMOE'] = self.models['TimeMOE'].predict_batch(
+                        history['Weekly_Close'].to_numpy(), start=n_train
+                    ).astype(float)
+                except Exception as e:
+                    self.logger.error(f"Error in TimeMOE model: {str(e)}")
+                    predictions['TimeMOE'] = np.full(n_windows, np.nan)
+            
+            for name in pool_models:
+                try:
+                    if parallel:
+                        predictions[name] = futures[name].result()
                     else:
-                        model.train(current_train)
-                    
-                    # Make prediction
-                    self.logger.info(f"Predicting with {name} model")
-                    pred = model.predict()
-                    
-                    # Handle different return types
-                    if hasattr(pred, 'item'):
-                        pred = pred.item()
-                    
-                    predictions[f'{name}_pred'] = pred
-                    
+                        predictions[name] = _rolling_forecast(name, self.models[name], *rolling_args)
                 except Exception as e:
                     self.logger.error(f"Error in {name} model: {str(e)}")
-                    predictions[f'{name}_pred'] = np.nan
-            
-            # Store actual value
-            predictions['actual'] = row['Weekly_Close']
-            results.append(predictions)
-            
-            # Update training data with the current observation
-            current_train = pd.concat([
-                current_train, 
-                pd.DataFrame([row])
-            ]).reset_index(drop=True)
+                    predictions[name] = np.full(n_windows, np.nan)
         
-        return pd.DataFrame(results)
+        results = pd.DataFrame({
+            'Date': test_data['Date'].to_numpy(),
+            'ticker': ticker,
+            **{f'{name}_pred': predictions[name] for name in self.models},
+            'actual': test_data['Weekly_Close'].to_numpy()
+        })
+        return results
     
     def forecast_next_week(self, data, ticker):
         """Generate forecast for next week using all available data.
@@ -128,14 +203,15 @@ class ModelTrainer:
         next_week_date = data['Date'].max() + timedelta(days=7)
         next_week_row = {'Date': next_week_date, 'actual': None, 'ticker': ticker}
 
-        # Get clean data for training (no missing values)
-        clean_data = data.dropna(subset=['Weekly_Close'])
+        # Get clean data for training (no missing values); data that is already
+        # clean, as passed by update_predictions, is used without a copy
+        clean_data = data.dropna(subset=['Weekly_Close']) if data['Weekly_Close'].hasnans else data
         
         for name, model in self.models.items():
             try:
                 self.logger.info(f"Training {name} on full dataset for next-week forecast")
                 
-                if name == 'SARIMA':
+                if name in ('SARIMA', 'AutoTS'):
                     model.train(clean_data, ticker=ticker)
                 else:
                     model.train(clean_data)
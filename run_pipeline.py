@@ -16,28 +16,57 @@ import sys
 import logging
 import argparse
 import datetime
-import glob
+import atexit
+import queue
+from logging.handlers import QueueHandler, QueueListener, MemoryHandler
 from dotenv import load_dotenv
 from pathlib import Path
 
 # Add project root to path to allow imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Import components from each module
-from scraping.update_all import DataUpdater
-from modelling.utils.file_utils import save_predictions
+# Load environment variables once, before any settings are read from them
+load_dotenv()
+
+# Import constants from each module; the components themselves pull in pandas,
+# torch, yfinance and the Azure SDK, so they are imported by the steps using them
 from modelling.config.constants import (
     PREDICTIONS_DIR,
     TIMEMOE_CACHE_DIR,
     SCRAPED_DATA_DIR,
-    CACHE_DIR
+    CACHE_DIR,
+    SARIMA_CACHE_DIR
 )
+from forecasting.src.config.constants import DEFAULT_DATA_DIR
 
-# Import storage utils (will be created)
-from utils.storage_utils import upload_to_blob_storage
+# Settings read from the environment
+FRED_API_KEY = os.getenv("FRED_API_KEY")
+AZURE_STORAGE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
 
 # Constants
 DEFAULT_BLOB_CONTAINER = "forecast-predictions"
+FORECASTING_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'forecasting')
+DEFAULT_UPLOAD_CONCURRENCY = 4
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_BUFFER_CAPACITY = 256  # Records buffered before writing to the persistent log
+
+# Data directories the pipeline writes to (symlinked to the file share in the container)
+REQUIRED_DATA_DIRS = [
+    str(PREDICTIONS_DIR),
+    str(SARIMA_CACHE_DIR),
+    str(TIMEMOE_CACHE_DIR),
+    str(SCRAPED_DATA_DIR),
+    DEFAULT_DATA_DIR
+]
+
+# Set once the data directories have been created
+_data_layout_ready = False
+
+# Background listener writing queued log records to the handlers
+_log_listener = None
+
+# Data updater shared by every scraping run in this process
+_data_updater = None
 
 
 def parse_args():
@@ -46,9 +75,6 @@ def parse_args():
     Returns:
         Parsed arguments
     """
-    # Load environment variables first
-    load_dotenv()
-    
     parser = argparse.ArgumentParser(
         description='Run the complete financial data pipeline: scraping, modeling, and forecasting'
     )
@@ -84,6 +110,21 @@ def parse_args():
         help=f'Azure Blob container name (default: {os.getenv("CONTAINER_NAME", DEFAULT_BLOB_CONTAINER)})'
     )
     
+    parser.add_argument(
+        '--modeling-jobs',
+        type=int,
+        default=1,
+        help='Number of prediction files to update in parallel (default: 1); each worker loads '
+             'its own models and logs to stderr rather than the pipeline log files'
+    )
+    
+    parser.add_argument(
+        '--upload-concurrency',
+        type=int,
+        default=DEFAULT_UPLOAD_CONCURRENCY,
+        help=f'Number of parallel connections per blob upload (default: {DEFAULT_UPLOAD_CONCURRENCY})'
+    )
+    
     parser.add_argument(
         '--log-level',
         type=str,
@@ -95,18 +136,66 @@ def parse_args():
     return parser.parse_args()
 
 
+def ensure_data_layout():
+    """Create the pipeline's data directories in a single pass.
+    
+    Runs at most once per process, so the later steps find their directories
+    in place instead of each creating them over the file share.
+    """
+    global _data_layout_ready
+    if _data_layout_ready:
+        return
+    
+    logger = logging.getLogger("pipeline.init")
+    for dir_path in REQUIRED_DATA_DIRS:
+        try:
+            os.makedirs(dir_path, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not create directory {dir_path}: {e}")
+    
+    _data_layout_ready = True
+
+
+def _stop_log_listener():
+    """Stop the logging listener and flush its handlers."""
+    global _log_listener
+    if _log_listener is None:
+        return
+    
+    _log_listener.stop()
+    for handler in _log_listener.handlers:
+        handler.close()
+    _log_listener = None
+
+
 def configure_logging(log_level):
     """Configure logging based on provided log level.
     
+    Records are put on an in-memory queue and written to the console and log
+    files by a background thread, so pipeline code never waits on a write to
+    the file share. The persistent log is also buffered and only written every
+    LOG_BUFFER_CAPACITY records, on errors, or at exit.
+    
+    Setup happens once per process; later calls only change the log level and
+    keep the existing handlers and log files.
+    
     Args:
         log_level: Name of the log level (e.g., 'INFO', 'DEBUG')
     """
-    level = getattr(logging, log_level.upper(), logging.INFO)
+    global _log_listener
     
-    # Get the root logger and clear any existing handlers to avoid duplication
+    level = getattr(logging, log_level.upper(), logging.INFO)
     root_logger = logging.getLogger()
+    
+    if _log_listener is not None:
+        root_logger.setLevel(level)
+        return
+    
+    # Clear any existing handlers to avoid duplication
     root_logger.handlers.clear()
     
+    formatter = logging.Formatter(LOG_FORMAT)
+    
     # Create handlers list
     handlers = [logging.StreamHandler()]
     
@@ -125,7 +214,13 @@ def configure_logging(log_level):
     # Try persistent storage file (via potential symlink)
     try:
         os.makedirs("logs", exist_ok=True)
-        handlers.append(logging.FileHandler(log_file_persistent))
+        persistent_handler = logging.FileHandler(log_file_persistent)
+        persistent_handler.setFormatter(formatter)
+        handlers.append(MemoryHandler(
+            LOG_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=persistent_handler
+        ))
         print(f"Logging to persistent file: {log_file_persistent}")
     except Exception as e:
         print(f"Warning: Could not create persistent log file: {e}")
@@ -133,31 +228,48 @@ def configure_logging(log_level):
     if len(handlers) == 1:
         print("Continuing with console logging only")
     
-    # Configure logging with available handlers
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=handlers,
-        force=True  # Force reconfiguration
-    )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    # Route all records through a queue drained by a background listener
+    log_queue = queue.Queue(-1)
+    root_logger.setLevel(level)
+    root_logger.addHandler(QueueHandler(log_queue))
+    
+    _log_listener = QueueListener(log_queue, *handlers)
+    _log_listener.start()
+    atexit.register(_stop_log_listener)
+
+
+def _get_data_updater():
+    """Get the shared data updater, creating it on first use.
+    
+    Reusing the updater keeps its scrapers and their API clients alive
+    across scraping runs in the same process.
+    
+    Returns:
+        DataUpdater instance
+    """
+    global _data_updater
+    if _data_updater is None:
+        from scraping.update_all import DataUpdater
+        _data_updater = DataUpdater(FRED_API_KEY)
+    return _data_updater
 
 
 def run_scraping():
     """Run the data scraping step."""
     logger = logging.getLogger("pipeline.scraping")
     
-    # Get FRED API key from environment
-    fred_api_key = os.getenv("FRED_API_KEY")
-    
-    if not fred_api_key:
+    if not FRED_API_KEY:
         logger.error("FRED_API_KEY not found in environment variables")
         sys.exit(1)
     
     logger.info("Starting data scraping step")
     
     try:
-        # Initialize the data updater (will use symlinked directories automatically)
-        updater = DataUpdater(fred_api_key)
+        # Get the data updater (will use symlinked directories automatically)
+        updater = _get_data_updater()
         
         # Run the update process - data will be saved via symlinks to file share
         updater.update_all_data(include_market=True)
@@ -170,8 +282,29 @@ def run_scraping():
         return False
 
 
-def run_modeling():
-    """Run the modeling and prediction step."""
+def list_prediction_files():
+    """List the model prediction files with a single directory scan.
+    
+    Returns:
+        Sorted list of prediction file paths
+    """
+    try:
+        with os.scandir(PREDICTIONS_DIR) as entries:
+            return sorted(
+                Path(entry.path) for entry in entries
+                if entry.name.startswith('model_predictions_') and entry.name.endswith('.csv')
+                and entry.is_file()
+            )
+    except FileNotFoundError:
+        return []
+
+
+def run_modeling(jobs=1):
+    """Run the modeling and prediction step.
+    
+    Args:
+        jobs: Number of prediction files to update in parallel (-1 uses all cores)
+    """
     logger = logging.getLogger("pipeline.modeling")
     logger.info("Starting modeling and prediction step")
     
@@ -182,16 +315,17 @@ def run_modeling():
         logger.info("Using symlinked directories for modeling")
         
         # Check for existing prediction files (through symlinks)
-        existing_files = list(Path(PREDICTIONS_DIR).glob('model_predictions_*.csv'))
+        existing_files = list_prediction_files()
         logger.info(f"Found {len(existing_files)} existing prediction files:")
         for file in existing_files:
             logger.info(f"  - {file.name}")
         
         # Check for existing scraped data (through symlinks)
+        # The directory entries carry their type, so no extra stat per folder
         scraped_data_files = []
         if os.path.exists(SCRAPED_DATA_DIR):
-            scraped_data_files = [f for f in os.listdir(SCRAPED_DATA_DIR) 
-                                if os.path.isdir(os.path.join(SCRAPED_DATA_DIR, f))]
+            with os.scandir(SCRAPED_DATA_DIR) as entries:
+                scraped_data_files = [entry.name for entry in entries if entry.is_dir()]
         logger.info(f"Found {len(scraped_data_files)} scraped data folders: {scraped_data_files}")
         
         # Create arguments object using constants (symlinked paths)
@@ -203,6 +337,7 @@ def run_modeling():
                 self.ticker = None
                 self.single_file = None
                 self.log_level = 'INFO'
+                self.jobs = jobs
         
         args = Args()
         
@@ -237,7 +372,7 @@ def run_forecasting():
     
     try:
         # Check for prediction files (through symlinked directories)
-        pred_files = list(Path(PREDICTIONS_DIR).glob('model_predictions_*.csv'))
+        pred_files = list_prediction_files()
         if not pred_files:
             logger.error(f"No prediction files found in: {PREDICTIONS_DIR}")
             return False
@@ -245,7 +380,8 @@ def run_forecasting():
         logger.info(f"Found {len(pred_files)} prediction files for forecasting")
         
         # Import forecasting components
-        sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'forecasting'))
+        if FORECASTING_DIR not in sys.path:
+            sys.path.insert(0, FORECASTING_DIR)
         import forecasting.main as forecasting_main
         
         # Run forecasting (will use symlinked data directories)
@@ -270,32 +406,33 @@ def get_output_files():
     """
     logger = logging.getLogger("pipeline.upload")
     
-    # Use constants to find output files through symlinks
-    from forecasting.src.config.constants import DEFAULT_DATA_DIR
-    
-    output_files = []
-    
-    # Find forecasting output files
-    forecasting_data_pattern = os.path.join(DEFAULT_DATA_DIR, "next_friday_predictions_*.json")
-    prediction_files = glob.glob(forecasting_data_pattern)
-    
-    # Also check for the main prediction file
-    main_prediction_file = os.path.join(DEFAULT_DATA_DIR, "next_friday_predictions.json")
-    if os.path.exists(main_prediction_file):
-        prediction_files.append(main_prediction_file)
+    # Scan the data directory once; on the file share every glob and stat is
+    # a network round trip, while scandir returns the file type with the names
+    try:
+        with os.scandir(DEFAULT_DATA_DIR) as entries:
+            json_files = [
+                entry for entry in entries
+                if entry.name.endswith(".json") and not entry.name.startswith(".")
+                and entry.is_file()
+            ]
+    except FileNotFoundError:
+        json_files = []
+    
+    # Forecasting output files go first, followed by any other JSON files
+    prediction_files = []
+    other_files = []
+    for entry in json_files:
+        if entry.name == "next_friday_predictions.json" or entry.name.startswith("next_friday_predictions_"):
+            prediction_files.append(entry.path)
+        else:
+            other_files.append(entry.path)
     
     for file_path in prediction_files:
-        if os.path.exists(file_path):
-            output_files.append(file_path)
-            logger.info(f"Found output file: {file_path}")
-    
-    # Find all JSON files in forecasting data directory
-    if os.path.exists(DEFAULT_DATA_DIR):
-        json_files = glob.glob(os.path.join(DEFAULT_DATA_DIR, "*.json"))
-        for json_file in json_files:
-            if json_file not in output_files:
-                output_files.append(json_file)
-                logger.info(f"Found additional JSON file: {json_file}")
+        logger.info(f"Found output file: {file_path}")
+    for file_path in other_files:
+        logger.info(f"Found additional JSON file: {file_path}")
+    
+    output_files = prediction_files + other_files
     
     if not output_files:
         logger.warning(f"No prediction files found in: {DEFAULT_DATA_DIR}")
@@ -304,12 +441,13 @@ def get_output_files():
     return output_files
 
 
-def upload_results_to_blob(container_name, output_files):
+def upload_results_to_blob(container_name, output_files, max_concurrency=DEFAULT_UPLOAD_CONCURRENCY):
     """Upload results to Azure Blob Storage.
     
     Args:
         container_name: Name of the Azure Blob container
         output_files: List of file paths to upload
+        max_concurrency: Number of parallel connections per blob upload
         
     Returns:
         bool: True if upload successful, False otherwise
@@ -323,12 +461,12 @@ def upload_results_to_blob(container_name, output_files):
     try:
         logger.info(f"Uploading {len(output_files)} files to Azure Blob Storage")
         
-        # Get Azure connection string from environment
-        connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
-        if not connection_string:
+        if not AZURE_STORAGE_CONNECTION_STRING:
             logger.error("AZURE_STORAGE_CONNECTION_STRING not found in environment variables")
             return False
         
+        from utils.storage_utils import upload_to_blob_storage
+        
         upload_count = 0
         for file_path in output_files:
             try:
@@ -340,7 +478,8 @@ def upload_results_to_blob(container_name, output_files):
                     file_path=file_path,
                     blob_name=blob_name,
                     container_name=container_name,
-                    connection_string=connection_string
+                    connection_string=AZURE_STORAGE_CONNECTION_STRING,
+                    max_concurrency=max_concurrency
                 )
                 
                 if success:
@@ -383,12 +522,24 @@ def verify_symlinks():
         "logs"
     ]
     
+    # List each parent directory once; the cached entries answer the symlink
+    # and existence checks without a round trip per check
+    entries = {}
+    for parent in {os.path.dirname(dir_path) or "." for dir_path in symlinked_dirs}:
+        try:
+            with os.scandir(parent) as it:
+                for entry in it:
+                    entries[os.path.normpath(entry.path)] = entry
+        except FileNotFoundError:
+            continue
+    
     all_good = True
     for dir_path in symlinked_dirs:
-        if os.path.islink(dir_path) and os.path.exists(dir_path):
+        entry = entries.get(os.path.normpath(dir_path))
+        if entry is not None and entry.is_symlink() and entry.is_dir():
             target = os.readlink(dir_path)
             logger.info(f"✓ Symlink verified: {dir_path} -> {target}")
-        elif os.path.exists(dir_path):
+        elif entry is not None and not entry.is_symlink():
             logger.info(f"? Directory exists (not symlinked): {dir_path}")
         else:
             logger.warning(f"✗ Missing directory/symlink: {dir_path}")
@@ -400,9 +551,14 @@ def verify_symlinks():
 def main():
     """Main function to run the complete pipeline."""
     try:
-        # Parse command line arguments (this also loads .env file)
+        # Parse command line arguments
         args = parse_args()
         
+        # Nothing to do: skip the log files, symlink checks and directory setup
+        if all([args.skip_scraping, args.skip_modeling, args.skip_forecasting, args.skip_upload]):
+            print("All pipeline steps skipped - nothing to do")
+            return
+        
         # Configure logging
         configure_logging(args.log_level)
         logger = logging.getLogger("pipeline")
@@ -411,6 +567,9 @@ def main():
         if not verify_symlinks():
             logger.warning("Some symlinks may not be set up correctly")
         
+        # Create any missing data directories before the steps run
+        ensure_data_layout()
+        
         logger.info("🚀 Starting Financial Data Pipeline")
         logger.info("=" * 50)
         
@@ -442,7 +601,7 @@ def main():
             logger.info("-" * 35)
             
             try:
-                if run_modeling():
+                if run_modeling(args.modeling_jobs):
                     steps_completed.append("Modeling")
                     logger.info("✅ Modeling completed successfully")
                 else:
@@ -479,7 +638,7 @@ def main():
             
             try:
                 output_files = get_output_files()
-                if upload_results_to_blob(args.container_name, output_files):
+                if upload_results_to_blob(args.container_name, output_files, args.upload_concurrency):
                     steps_completed.append("Upload")
                     logger.info("✅ Upload completed successfully")
                 else:
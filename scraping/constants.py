@@ -14,6 +14,9 @@ OUTPUT_DIR: str = "scraping/scraped_data"
 COMPANY_DATA_FILENAME: str = "{ticker}_data.csv"
 MARKET_DATA_FILENAME: str = "market_data.csv"
 
+# Maximum number of tickers downloaded at the same time
+MAX_CONCURRENT_DOWNLOADS: int = 8
+
 # Data processing constants
 DAYS_FOR_RECENT_CHECK: int = 7
 DEFAULT_RESAMPLE_METHOD: str = "last"
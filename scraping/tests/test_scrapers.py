@@ -2,6 +2,7 @@
 Example unit tests for the refactored scraping system.
 Run with: python -m pytest tests/
 """
+import time
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 import pandas as pd
@@ -10,6 +11,7 @@ from datetime import datetime
 from scrapers.company_scraper import CompanyScraper
 from scraping.core.data_processor import DataProcessor
 from scraping.core.file_manager import FileManager
+from scraping.update_all import DataUpdater
 
 
 class TestCompanyScraper(unittest.TestCase):
@@ -148,5 +150,61 @@ class TestFileManager(unittest.TestCase):
             mock_create.assert_called_once()
 
 
+class TestDataUpdater(unittest.TestCase):
+    """Test cases for DataUpdater."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.updater = DataUpdater("test_key")
+    
+    @patch('scraping.update_all.MarketScraper')
+    @patch('scraping.update_all.CompanyScraper')
+    def test_update_all_data(self, mock_company_scraper, mock_market_scraper):
+        """Test that every ticker is updated after the market data."""
+        calls = []
+        
+        def update_market():
+            calls.append('market started')
+            # Give concurrently running company updates a chance to show up
+            time.sleep(0.05)
+            calls.append('market finished')
+            return True
+        mock_market_scraper.return_value.update_data.side_effect = update_market
+        
+        def make_scraper(ticker):
+            scraper = Mock()
+            scraper.update_data.side_effect = lambda: calls.append(ticker) or True
+            return scraper
+        mock_company_scraper.side_effect = make_scraper
+        
+        with patch.object(self.updater, '_discover_existing_tickers', return_value={'AAPL', 'MSFT', 'GOOG'}):
+            self.updater.update_all_data(include_market=True)
+        
+        self.assertEqual(calls[:2], ['market started', 'market finished'])
+        self.assertEqual(sorted(calls[2:]), ['AAPL', 'GOOG', 'MSFT'])
+    
+    @patch('scraping.update_all.MarketScraper')
+    @patch('scraping.update_all.CompanyScraper')
+    def test_update_all_data_contains_errors(self, mock_company_scraper, mock_market_scraper):
+        """Test that a failing update does not stop the others."""
+        updated = []
+        mock_market_scraper.return_value.update_data.side_effect = RuntimeError("FRED unavailable")
+        
+        def make_scraper(ticker):
+            scraper = Mock()
+            if ticker == 'AAPL':
+                scraper.update_data.side_effect = RuntimeError("download failed")
+            else:
+                scraper.update_data.side_effect = lambda: updated.append(ticker) or True
+            return scraper
+        mock_company_scraper.side_effect = make_scraper
+        
+        with patch.object(self.updater, '_discover_existing_tickers', return_value={'AAPL', 'MSFT', 'GOOG'}):
+            self.updater.update_all_data(include_market=True)
+        
+        self.assertEqual(sorted(updated), ['GOOG', 'MSFT'])
+        self.assertEqual(mock_company_scraper.call_count, 3)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,13 +4,14 @@ Update script for refreshing existing financial data.
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Set
 from dotenv import load_dotenv
 
 # Add the parent directory to the path for absolute imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from scraping.constants import OUTPUT_DIR, DEFAULT_START_DATE
+from scraping.constants import OUTPUT_DIR, DEFAULT_START_DATE, MAX_CONCURRENT_DOWNLOADS
 from scraping.scrapers import CompanyScraper, MarketScraper
 from scraping.core.logger import ScraperLogger
 
@@ -26,6 +27,10 @@ class DataUpdater:
         """
         self.fred_api_key = fred_api_key
         self.logger = ScraperLogger.get_logger("DataUpdater")
+        
+        # Scrapers hold no per-run state, so they are built once and reused
+        self._market_scraper = None
+        self._company_scrapers = {}
     
     def _extract_ticker_from_folder(self, folder_name: str) -> str:
         """Extract ticker symbol from folder name.
@@ -47,13 +52,16 @@ class DataUpdater:
         """
         tickers = set()
         
-        if not os.path.exists(OUTPUT_DIR):
-            return tickers
-        
-        for entry in os.listdir(OUTPUT_DIR):
-            ticker = self._extract_ticker_from_folder(entry)
-            if ticker:
-                tickers.add(ticker)
+        # A single scan; the entries carry their type, so stray files are
+        # skipped without a stat per entry
+        try:
+            with os.scandir(OUTPUT_DIR) as entries:
+                for entry in entries:
+                    ticker = self._extract_ticker_from_folder(entry.name)
+                    if ticker and entry.is_dir():
+                        tickers.add(ticker)
+        except FileNotFoundError:
+            pass
         
         return tickers
     
@@ -65,8 +73,9 @@ class DataUpdater:
         """
         print("📈 Updating market data...")
         try:
-            scraper = MarketScraper(self.fred_api_key)
-            success = scraper.update_data()
+            if self._market_scraper is None:
+                self._market_scraper = MarketScraper(self.fred_api_key)
+            success = self._market_scraper.update_data()
             
             if success:
                 print("✅ Market data update completed!")
@@ -78,27 +87,41 @@ class DataUpdater:
             print(f"❌ Error updating market data: {e}")
             return False
     
+    def _update_ticker(self, ticker: str) -> None:
+        """Update company data for a single ticker.
+        
+        Args:
+            ticker: Ticker symbol to update
+        """
+        print(f"Updating {ticker}...")
+        try:
+            scraper = self._company_scrapers.get(ticker)
+            if scraper is None:
+                scraper = self._company_scrapers[ticker] = CompanyScraper(ticker)
+            success = scraper.update_data()
+            
+            if success:
+                print(f"✅ {ticker} update completed!")
+            else:
+                print(f"ℹ️ {ticker} update not needed or failed")
+                
+        except Exception as e:
+            print(f"❌ Error updating {ticker}: {e}")
+    
     def update_company_data(self, tickers: Set[str]) -> None:
         """Update company data for multiple tickers.
         
+        Each ticker is fetched in its own thread, since the updates are
+        independent and mostly wait on the network.
+        
         Args:
             tickers: Set of ticker symbols to update
         """
         print(f"📊 Updating company data for {len(tickers)} tickers...")
         
-        for ticker in sorted(tickers):
-            print(f"Updating {ticker}...")
-            try:
-                scraper = CompanyScraper(ticker)
-                success = scraper.update_data()
-                
-                if success:
-                    print(f"✅ {ticker} update completed!")
-                else:
-                    print(f"ℹ️ {ticker} update not needed or failed")
-                    
-            except Exception as e:
-                print(f"❌ Error updating {ticker}: {e}")
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOWNLOADS) as executor:
+            # Consume the results so every update has finished on return
+            list(executor.map(self._update_ticker, sorted(tickers)))
     
     def update_all_data(self, include_market: bool = True) -> None:
         """Update all existing data.
@@ -108,7 +131,9 @@ class DataUpdater:
         """
         print("🔄 Starting data update process...")
         
-        # Update market data first
+        # Update market data first; yf.download keeps module-global state
+        # that is not safe to share with the company downloads running in
+        # threads, so it must finish before they start
         if include_market:
             self.update_market_data()
         
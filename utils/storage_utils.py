@@ -3,6 +3,7 @@ Utility functions for Azure Storage operations.
 """
 import os
 import logging
+import mmap
 import shutil
 from pathlib import Path
 from azure.storage.blob import BlobServiceClient, ContentSettings
@@ -10,7 +11,36 @@ from azure.storage.fileshare import ShareServiceClient, ShareDirectoryClient
 
 logger = logging.getLogger(__name__)
 
-def upload_to_blob_storage(file_path, container_name, blob_name=None, connection_string=None):
+# Seconds to wait when opening a connection to Blob Storage
+BLOB_CONNECTION_TIMEOUT = 60
+
+# Blob service clients by connection string, reused so that uploads share
+# connections instead of doing a TLS handshake each
+_blob_service_clients = {}
+
+
+def get_blob_service_client(connection_string):
+    """
+    Get a shared Blob service client for a connection string.
+    
+    Args:
+        connection_string: Azure Storage connection string
+    
+    Returns:
+        BlobServiceClient for the storage account
+    """
+    client = _blob_service_clients.get(connection_string)
+    if client is None:
+        client = BlobServiceClient.from_connection_string(
+            connection_string,
+            connection_timeout=BLOB_CONNECTION_TIMEOUT
+        )
+        _blob_service_clients[connection_string] = client
+    return client
+
+
+def upload_to_blob_storage(file_path, container_name, blob_name=None, connection_string=None,
+                           max_concurrency=1):
     """
     Upload a file to Azure Blob Storage.
     
@@ -19,6 +49,7 @@ def upload_to_blob_storage(file_path, container_name, blob_name=None, connection
         container_name: Azure Storage container name
         blob_name: Name for the blob (if None, uses the file basename)
         connection_string: Azure Storage connection string (if None, uses environment variable)
+        max_concurrency: Number of blocks uploaded in parallel for large files
     
     Returns:
         URL of the uploaded blob, or None if upload failed
@@ -36,8 +67,8 @@ def upload_to_blob_storage(file_path, container_name, blob_name=None, connection
         return None
     
     try:
-        # Create blob service client
-        blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+        # Get blob service client
+        blob_service_client = get_blob_service_client(connection_string)
         
         # Get or create container
         try:
@@ -64,10 +95,24 @@ def upload_to_blob_storage(file_path, container_name, blob_name=None, connection
         content_type = "application/json" if file_path.endswith(".json") else "application/octet-stream"
         content_settings = ContentSettings(content_type=content_type)
         
-        # Upload file
-        with open(file_path, "rb") as data:
-            logger.info(f"Uploading {file_path} to {container_name}/{blob_name}")
-            blob_client.upload_blob(data, overwrite=True, content_settings=content_settings)
+        # Upload straight from a memory map of the file, so the SDK reads its
+        # blocks from the page cache without an intermediate copy; the length
+        # lets it split the file into blocks sent over max_concurrency connections
+        logger.info(f"Uploading {file_path} to {container_name}/{blob_name}")
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # Empty files cannot be memory-mapped
+                blob_client.upload_blob(b"", overwrite=True, content_settings=content_settings)
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    blob_client.upload_blob(
+                        data,
+                        blob_type="BlockBlob",
+                        length=len(data),
+                        overwrite=True,
+                        content_settings=content_settings,
+                        max_concurrency=max_concurrency
+                    )
         
         # Get blob URL
         account_name = blob_service_client.account_name